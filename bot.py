@@ -129,6 +129,13 @@ async def on_guild_join(guild):
             "To get started, server admins can use `/server setup` to configure game server connections."
         )
 
+@bot.event
+async def on_member_update(before, after):
+    """Called when a member's roles or profile change."""
+    # Role changes can grant or revoke admin, so drop any cached admin check
+    from utils.helpers import invalidate_admin_cache
+    invalidate_admin_cache(after.id)
+
 @bot.event
 async def on_command_error(ctx, error):
     """Global error handler for traditional commands."""
@@ -218,6 +225,10 @@ async def initialize_bot(force_sync=False):
     # Attach the database manager to the bot for global access
     bot.db = db_manager
     logger.info("Database connection established")
+
+    # Ensure the indexes server lookups rely on
+    from utils.server_utils import create_indexes
+    await create_indexes(db_manager)
     
     # Load all cogs
     logger.info("Loading cogs...")
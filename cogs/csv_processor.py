@@ -21,7 +21,7 @@ from utils.csv_parser import CSVParser
 from utils.sftp import SFTPManager
 from utils.embed_builder import EmbedBuilder
 from utils.helpers import has_admin_permission
-from utils.parser_utils import parser_coordinator, normalize_event_data, categorize_event
+from utils.parser_utils import parser_coordinator, normalize_events, categorize_event
 
 logger = logging.getLogger(__name__)
 
@@ -181,11 +181,10 @@ class CSVProcessorCog(commands.Cog):
                             processed_count = 0
                             errors = []
                             
-                            for event in events:
+                            # Normalize the freshly parsed batch in place; rows
+                            # that fail to normalize are counted as errors
+                            for normalized_event in normalize_events(events, errors):
                                 try:
-                                    # Normalize event data
-                                    normalized_event = normalize_event_data(event)
-                                    
                                     # Add server ID
                                     normalized_event["server_id"] = server_id
                                     
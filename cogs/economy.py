@@ -1286,7 +1286,7 @@ class Economy(commands.Cog):
 
             # Create roulette game
             from utils.gambling import RouletteView
-            view = RouletteView(str(ctx.author.id), economy, bet)
+            view = RouletteView(ctx.author.id, economy, bet)
 
             # Send initial embed
             embed = discord.Embed(
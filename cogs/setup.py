@@ -389,14 +389,13 @@ class Setup(commands.Cog):
                 return
 
             # Check if server ID already exists
-            for server in guild.servers:
-                if server.get("server_id") == server_id:
-                    embed = await EmbedBuilder.create_error_embed(
-                        "Server Exists",
-                        f"A server with ID '{server_id}' already exists in this guild."
-                    , guild=guild_model)
-                    await ctx.send(embed=embed)
-                    return
+            if any(server.get("server_id") == server_id for server in guild.servers):
+                embed = await EmbedBuilder.create_error_embed(
+                    "Server Exists",
+                    f"A server with ID '{server_id}' already exists in this guild."
+                , guild=guild_model)
+                await ctx.send(embed=embed)
+                return
 
             # Initial response
             embed = await EmbedBuilder.create_base_embed(
@@ -8,6 +8,8 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, ClassVar, List
 
+from pymongo import ReturnDocument
+
 from models.base_model import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -260,8 +262,8 @@ class Bounty(BaseModel):
         self.claimed_at = datetime.utcnow()
         self.updated_at = datetime.utcnow()
         
-        # Update in database
-        result = await db.bounties.update_one(
+        # Update in database and read back the stored state in one round-trip
+        document = await db.bounties.find_one_and_update(
             {"bounty_id": self.bounty_id},
             {"$set": {
                 "status": self.status,
@@ -269,10 +271,15 @@ class Bounty(BaseModel):
                 "claimed_by_name": self.claimed_by_name,
                 "claimed_at": self.claimed_at,
                 "updated_at": self.updated_at
-            }}
+            }},
+            return_document=ReturnDocument.AFTER
         )
         
-        return result.modified_count > 0
+        if not document:
+            return False
+        
+        self.status = document.get("status", self.status)
+        return True
     
     async def expire(self, db) -> bool:
         """Expire a bounty
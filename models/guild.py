@@ -92,7 +92,9 @@ class Guild(BaseModel):
         self.servers.append(server_data)
         self.updated_at = datetime.utcnow()
 
-        # Update in database
+        # Update in database, keeping server IDs stored as strings
+        from utils.server_utils import normalize_guild_document, invalidate_server
+        normalize_guild_document({"servers": self.servers})
         result = await self.db.guilds.update_one(
             {"guild_id": self.guild_id},
             {
@@ -103,6 +105,8 @@ class Guild(BaseModel):
             }
         )
 
+        invalidate_server(server_data["server_id"], self.guild_id)
+
         return result.modified_count > 0
 
     async def remove_server(self, server_id: str) -> bool:
@@ -118,7 +122,9 @@ class Guild(BaseModel):
         self.servers = [s for s in self.servers if str(s.get("server_id")) != str(server_id)]
         self.updated_at = datetime.utcnow()
 
-        # Update in database
+        # Update in database, keeping server IDs stored as strings
+        from utils.server_utils import normalize_guild_document, invalidate_server
+        normalize_guild_document({"servers": self.servers})
         result = await self.db.guilds.update_one(
             {"guild_id": self.guild_id},
             {
@@ -129,6 +135,8 @@ class Guild(BaseModel):
             }
         )
 
+        invalidate_server(server_id, self.guild_id)
+
         return result.modified_count > 0
 
     async def get_server(self, server_id: str) -> Optional[Dict[str, Any]]:
@@ -140,8 +148,12 @@ class Guild(BaseModel):
         Returns:
             Optional[Dict]: Server data if found, None otherwise
         """
+        # Not memoized: entries change in place (normalize_guild_document,
+        # direct edits) and a replaced list can reuse the old one's id(), so
+        # an index keyed on the list would go stale
+        str_server_id = str(server_id)
         for server in self.servers:
-            if str(server.get("server_id")) == str(server_id):
+            if str(server.get("server_id")) == str_server_id:
                 return server
         return None
 
@@ -163,7 +175,7 @@ class Guild(BaseModel):
             Guild object or None if not found
         """
         document = await db.guilds.find_one({"guild_id": guild_id})
-        return cls.from_document(document, db) if document else None
+        return await cls.from_document(document, db) if document else None
 
     async def set_premium_tier(self, db, tier: int) -> bool:
         """Set premium tier for guild
@@ -62,17 +62,30 @@ class Player(BaseModel):
                 setattr(self, key, value)
     
     @classmethod
-    async def get_by_player_id(cls, db, player_id: str) -> Optional['Player']:
+    async def get_by_player_id(
+        cls,
+        db,
+        player_id: str,
+        guild_id: Optional[str] = None,
+        server_id: Optional[str] = None
+    ) -> Optional['Player']:
         """Get a player by player_id
         
         Args:
             db: Database connection
             player_id: Player ID
+            guild_id: Optional guild ID to scope the lookup to
+            server_id: Optional server ID to scope the lookup to
             
         Returns:
             Player object or None if not found
         """
-        document = await db.players.find_one({"player_id": player_id})
+        query = {"player_id": player_id}
+        if guild_id is not None:
+            query["guild_id"] = guild_id
+        if server_id is not None:
+            query["server_id"] = server_id
+        document = await db.players.find_one(query)
         return cls.from_document(document) if document else None
     
     @classmethod
@@ -0,0 +1,112 @@
+"""
+Test the exact dealer outcome probabilities used by blackjack
+
+This script checks dealer_outcome_probabilities in utils/gambling.py: every
+upcard's distribution must sum to 1, the well-known bust rate for a ten
+upcard must come out, and a plain Monte Carlo dealer must agree with it.
+"""
+
+import logging
+import random
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Blackjack values of a single deck: aces as 11, tens and faces as 10
+FULL_DECK = [11] * 4 + [value for value in range(2, 10) for _ in range(4)] + [10] * 16
+
+def simulate_dealer(upcard, trials, rng):
+    """Estimate the dealer's outcome distribution by playing hands out"""
+    counts = {}
+    deck = list(FULL_DECK)
+    deck.remove(upcard)
+    for _ in range(trials):
+        rng.shuffle(deck)
+        total, aces = upcard, int(upcard == 11)
+        for card in deck:
+            if total >= 17:
+                break
+            total += card
+            aces += card == 11
+            while total > 21 and aces:
+                total -= 10
+                aces -= 1
+        outcome = "bust" if total > 21 else total
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return {outcome: count / trials for outcome, count in counts.items()}
+
+def test_distributions_sum_to_one():
+    """Every upcard yields a complete distribution over DEALER_OUTCOMES"""
+    from utils.gambling import DEALER_OUTCOMES, dealer_outcome_probabilities
+
+    for upcard in range(2, 12):
+        probabilities = dealer_outcome_probabilities(upcard)
+        assert set(probabilities) == set(DEALER_OUTCOMES)
+        assert all(0.0 <= p <= 1.0 for p in probabilities.values())
+        assert abs(sum(probabilities.values()) - 1.0) < 1e-9, f"upcard {upcard} sums to {sum(probabilities.values())}"
+    logger.info("All upcard distributions sum to 1")
+
+def test_ten_upcard_bust_rate():
+    """A single-deck dealer standing on all 17s busts about 21% of the time under a ten"""
+    from utils.gambling import dealer_outcome_probabilities
+
+    bust = dealer_outcome_probabilities(10)["bust"]
+    logger.info(f"Dealer bust probability with a ten up: {bust:.4f}")
+    assert 0.20 < bust < 0.22
+
+def test_matches_simulation():
+    """The exact distribution agrees with a Monte Carlo dealer"""
+    from utils.gambling import dealer_outcome_probabilities
+
+    rng = random.Random(2024)
+    for upcard in (6, 10, 11):
+        exact = dealer_outcome_probabilities(upcard)
+        simulated = simulate_dealer(upcard, 20000, rng)
+        for outcome, probability in exact.items():
+            # Over 4 standard errors for 20000 trials
+            assert abs(simulated.get(outcome, 0.0) - probability) < 0.015, (upcard, outcome)
+        logger.info(f"Upcard {upcard} matches the simulation")
+
+def test_explicit_composition():
+    """A deck of only tens leaves a ten upcard on exactly 20"""
+    from utils.gambling import dealer_outcome_probabilities
+
+    only_tens = (0,) * 8 + (15, 0)
+    probabilities = dealer_outcome_probabilities(10, only_tens)
+    assert probabilities[20] == 1.0 and probabilities["bust"] == 0.0
+
+def test_rejects_invalid_input():
+    """Out-of-range upcards and malformed compositions raise ValueError"""
+    from utils.gambling import dealer_outcome_probabilities
+
+    for upcard in (0, 1, 12):
+        try:
+            dealer_outcome_probabilities(upcard)
+        except ValueError:
+            continue
+        raise AssertionError(f"upcard {upcard} should be rejected")
+
+    try:
+        dealer_outcome_probabilities(10, (4,) * 9)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a 9-entry composition should be rejected")
+    logger.info("Invalid upcards and compositions are rejected")
+
+def main():
+    """Run all tests"""
+    logger.info("Testing dealer outcome probabilities...")
+
+    test_distributions_sum_to_one()
+    test_ten_upcard_bust_rate()
+    test_matches_simulation()
+    test_explicit_composition()
+    test_rejects_invalid_input()
+
+    logger.info("All tests completed")
+
+if __name__ == "__main__":
+    main()
@@ -19,18 +19,20 @@ import asyncio
 import datetime
 import logging
 import os
+import secrets
 import sys
 from typing import Dict, List, Any, Optional, Tuple
 import uuid
 
-# Set up logging
+# Set up logging (file output only when MULTI_GUILD_LOG is set)
+log_handlers = [logging.StreamHandler()]
+if os.getenv("MULTI_GUILD_LOG"):
+    log_handlers.append(logging.FileHandler("multi_guild_test.log"))
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("multi_guild_test.log")
-    ]
+    handlers=log_handlers
 )
 logger = logging.getLogger(__name__)
 
@@ -76,6 +78,41 @@ class MultiGuildTestSuite:
         else:
             logger.info(f"TEST {status}: {test_name}")
     
+    async def _fetch_players_by_guild(self, player_id: str) -> Dict[str, Any]:
+        """Look up a player in every test guild through the Player model
+        
+        Args:
+            player_id: Player ID shared across the test guilds
+            
+        Returns:
+            Dict mapping guild ID to the Player found for that guild, or None
+        """
+        from models.player import Player
+        
+        guild_ids = [guild["guild_id"] for guild in self.test_guilds]
+        players = await asyncio.gather(*[
+            Player.get_by_player_id(self.db, player_id, guild_id, f"{guild_id}_server_1")
+            for guild_id in guild_ids
+        ])
+        return dict(zip(guild_ids, players))
+    
+    async def _fetch_guilds(self) -> Dict[str, Any]:
+        """Look up every test guild through the Guild model
+        
+        Returns:
+            Dict mapping guild ID to the Guild found for it, or None
+        """
+        from models.guild import Guild
+        
+        guild_ids = [guild["guild_id"] for guild in self.test_guilds]
+        guilds = await asyncio.gather(*[Guild.get_by_guild_id(self.db, guild_id) for guild_id in guild_ids])
+        return dict(zip(guild_ids, guilds))
+    
+    @staticmethod
+    def _premium_tier(guild) -> Optional[int]:
+        """Read the premium tier the test stores under data.settings"""
+        return (getattr(guild, "data", None) or {}).get("settings", {}).get("premium_tier")
+    
     async def setup(self):
         """Set up test environment and create test guilds"""
         logger.info("Setting up multi-guild test environment...")
@@ -88,29 +125,25 @@ class MultiGuildTestSuite:
             # Create test guild IDs (using unique values for testing)
             self.test_guilds = [
                 {
-                    "guild_id": f"test_guild_{uuid.uuid4().hex[:8]}",
+                    "guild_id": f"test_guild_{secrets.token_hex(4)}",
                     "name": "Test Guild Alpha"
                 },
                 {
-                    "guild_id": f"test_guild_{uuid.uuid4().hex[:8]}",
+                    "guild_id": f"test_guild_{secrets.token_hex(4)}",
                     "name": "Test Guild Beta"
                 },
                 {
-                    "guild_id": f"test_guild_{uuid.uuid4().hex[:8]}",
+                    "guild_id": f"test_guild_{secrets.token_hex(4)}",
                     "name": "Test Guild Gamma"
                 }
             ]
             
-            # Import guild model
-            from models.guild import Guild
-            
-            # Create test guilds
-            for guild_data in self.test_guilds:
-                # Create guild object
-                guild = Guild(
-                    guild_id=guild_data["guild_id"],
-                    name=guild_data["name"],
-                    data={
+            # Build guild documents directly; only the persisted shape matters here
+            guild_docs = [
+                {
+                    "guild_id": guild_data["guild_id"],
+                    "name": guild_data["name"],
+                    "data": {
                         "servers": [
                             {
                                 "server_id": f"{guild_data['guild_id']}_server_1",
@@ -130,9 +163,12 @@ class MultiGuildTestSuite:
                             "timezone": "UTC"
                         }
                     }
-                )
-                # Insert into database
-                await self.db.guilds.insert_one(guild.to_document())
+                }
+                for guild_data in self.test_guilds
+            ]
+            
+            # Insert into database
+            await self.db.guilds.insert_many(guild_docs)
             
             logger.info(f"Created {len(self.test_guilds)} test guilds")
             return True
@@ -166,20 +202,20 @@ class MultiGuildTestSuite:
         logger.info("Testing guild configuration isolation...")
         
         try:
-            from models.guild import Guild
-            
             # Test getting guild data
+            guilds_by_id = await self._fetch_guilds()
+            
             for guild_data in self.test_guilds:
                 guild_id = guild_data["guild_id"]
-                retrieved_guild = await Guild.get_by_guild_id(self.db, guild_id)
+                retrieved_guild = guilds_by_id.get(guild_id)
                 
                 if not retrieved_guild:
                     self._record_result("guild_retrieval", False, f"Failed to retrieve guild {guild_id}")
                     continue
                 
-                if retrieved_guild.get("name") != guild_data["name"]:
+                if retrieved_guild.name != guild_data["name"]:
                     self._record_result("guild_name_match", False, 
-                                      f"Guild name mismatch: {retrieved_guild.get('name')} != {guild_data['name']}")
+                                      f"Guild name mismatch: {retrieved_guild.name} != {guild_data['name']}")
                 else:
                     self._record_result("guild_name_match", True)
             
@@ -193,17 +229,17 @@ class MultiGuildTestSuite:
                 {"$set": {"data.settings.premium_tier": 2}}
             )
             
+            guilds_by_id = await self._fetch_guilds()
+            
             # Verify the change in target guild
-            updated_target = await Guild.get_by_guild_id(self.db, target_guild["guild_id"])
-            target_premium = updated_target.get("data", {}).get("settings", {}).get("premium_tier")
+            target_premium = self._premium_tier(guilds_by_id.get(target_guild["guild_id"]))
             
             self._record_result("target_guild_update", target_premium == 2,
                               f"Target guild premium tier should be 2, got {target_premium}")
             
             # Verify other guilds are unchanged
             for other_guild in other_guilds:
-                unchanged = await Guild.get_by_guild_id(self.db, other_guild["guild_id"])
-                other_premium = unchanged.get("data", {}).get("settings", {}).get("premium_tier")
+                other_premium = self._premium_tier(guilds_by_id.get(other_guild["guild_id"]))
                 
                 self._record_result("other_guild_unchanged", other_premium == 0,
                                   f"Other guild premium tier should be 0, got {other_premium}")
@@ -217,33 +253,34 @@ class MultiGuildTestSuite:
         logger.info("Testing player data isolation...")
         
         try:
-            from models.player import Player
-            
             # Create identical player IDs across different guilds
             common_player_id = "test_player_isolation"
             
             # Create the player in each guild with different names
-            for i, guild_data in enumerate(self.test_guilds):
-                guild_id = guild_data["guild_id"]
-                server_id = f"{guild_id}_server_1"
-                
-                # Create player
-                player = Player(
-                    player_id=common_player_id,
-                    name=f"Player in {guild_data['name']}",
-                    guild_id=guild_id,
-                    server_id=server_id,
-                    kills=i * 10,  # Different stats for each guild
-                    deaths=i * 5
-                )
-                await self.db.players.insert_one(player.to_document())
+            now = datetime.datetime.utcnow()
+            player_docs = [
+                {
+                    "player_id": common_player_id,
+                    "name": f"Player in {guild_data['name']}",
+                    "display_name": f"Player in {guild_data['name']}",
+                    "guild_id": guild_data["guild_id"],
+                    "server_id": f"{guild_data['guild_id']}_server_1",
+                    "kills": i * 10,  # Different stats for each guild
+                    "deaths": i * 5,
+                    "suicides": 0,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for i, guild_data in enumerate(self.test_guilds)
+            ]
+            await self.db.players.insert_many(player_docs)
             
             # Verify each guild has its own isolated player data
+            players = await self._fetch_players_by_guild(common_player_id)
             for i, guild_data in enumerate(self.test_guilds):
                 guild_id = guild_data["guild_id"]
-                server_id = f"{guild_id}_server_1"
                 
-                player = await Player.get_by_player_id(self.db, common_player_id, guild_id, server_id)
+                player = players.get(guild_id)
                 
                 if not player:
                     self._record_result("player_retrieval", False, 
@@ -251,9 +288,9 @@ class MultiGuildTestSuite:
                     continue
                 
                 expected_kills = i * 10
-                if player.get("kills") != expected_kills:
+                if player.kills != expected_kills:
                     self._record_result("player_stats_isolation", False,
-                                      f"Player kills mismatch: {player.get('kills')} != {expected_kills}")
+                                      f"Player kills mismatch: {player.kills} != {expected_kills}")
                 else:
                     self._record_result("player_stats_isolation", True)
             
@@ -269,23 +306,19 @@ class MultiGuildTestSuite:
             )
             
             # Verify the update in target guild
-            updated_player = await Player.get_by_player_id(
-                self.db, common_player_id, target_guild_id, target_server_id
-            )
+            players = await self._fetch_players_by_guild(common_player_id)
+            updated_kills = getattr(players.get(target_guild_id), "kills", None)
             
-            self._record_result("target_player_update", updated_player.get("kills") == 999,
-                              f"Target player kills should be 999, got {updated_player.get('kills')}")
+            self._record_result("target_player_update", updated_kills == 999,
+                              f"Target player kills should be 999, got {updated_kills}")
             
             # Verify other guilds are unchanged
             for i, guild_data in enumerate(self.test_guilds[1:], 1):
-                guild_id = guild_data["guild_id"]
-                server_id = f"{guild_id}_server_1"
-                
-                other_player = await Player.get_by_player_id(self.db, common_player_id, guild_id, server_id)
+                other_kills = getattr(players.get(guild_data["guild_id"]), "kills", None)
                 expected_kills = i * 10
                 
-                self._record_result("other_player_unchanged", other_player.get("kills") == expected_kills,
-                                  f"Other player kills should be {expected_kills}, got {other_player.get('kills')}")
+                self._record_result("other_player_unchanged", other_kills == expected_kills,
+                                  f"Other player kills should be {expected_kills}, got {other_kills}")
             
         except Exception as e:
             logger.error(f"Error testing player data isolation: {e}")
@@ -312,12 +345,13 @@ class MultiGuildTestSuite:
                 else:
                     self._record_result("server_count", True)
                 
-                # Each server should have the correct guild prefix in ID
+                # Each server should be one of this guild's own servers
+                expected_server_ids = {f"{guild_id}_server_{i}" for i in (1, 2)}
                 for server in servers:
                     server_id = server.get("server_id", "")
-                    if not server_id.startswith(guild_id):
+                    if server_id not in expected_server_ids:
                         self._record_result("server_id_prefix", False,
-                                          f"Server ID {server_id} does not have guild prefix {guild_id}")
+                                          f"Server ID {server_id} does not belong to guild {guild_id}")
                     else:
                         self._record_result("server_id_prefix", True)
             
@@ -347,6 +381,7 @@ class MultiGuildTestSuite:
         logger.info("Testing bounty system isolation...")
         
         try:
+            from pymongo import InsertOne
             from models.bounty import Bounty
             
             # Create bounties in each guild
@@ -356,28 +391,33 @@ class MultiGuildTestSuite:
             # Create common bounty target in all guilds
             target_id = "common_bounty_target"
             
-            for i, guild_data in enumerate(self.test_guilds):
-                guild_id = guild_data["guild_id"]
-                server_id = f"{guild_id}_server_1"
-                
-                # Create bounty
-                bounty = Bounty(
-                    guild_id=guild_id,
-                    server_id=server_id,
-                    target_id=target_id,
-                    target_name=f"Target in {guild_data['name']}",
-                    placed_by_id="12345",
-                    placed_by_name="Test Creator",
-                    amount=(i + 1) * 1000,  # Different reward per guild
-                    status=Bounty.STATUS_ACTIVE,
-                    bounty_type=Bounty.TYPE_PLAYER,
-                    created_at=now,
-                    expires_at=expires,
-                    requirement={"reason": f"Test bounty in {guild_data['name']}"}
-                )
-                
-                # Insert into database
-                await self.db.bounties.insert_one(bounty.to_document())
+            bounty_docs = [
+                {
+                    "bounty_id": str(uuid.uuid4()),
+                    "guild_id": guild_data["guild_id"],
+                    "server_id": f"{guild_data['guild_id']}_server_1",
+                    "target_id": target_id,
+                    "target_name": f"Target in {guild_data['name']}",
+                    "placed_by_id": "12345",
+                    "placed_by_name": "Test Creator",
+                    "amount": (i + 1) * 1000,  # Different reward per guild
+                    "status": Bounty.STATUS_ACTIVE,
+                    "bounty_type": Bounty.TYPE_PLAYER,
+                    "claimed_by_id": None,
+                    "claimed_by_name": None,
+                    "claimed_at": None,
+                    "created_at": now,
+                    "updated_at": now,
+                    "expires_at": expires,
+                    "requirement": {"reason": f"Test bounty in {guild_data['name']}"}
+                }
+                for i, guild_data in enumerate(self.test_guilds)
+            ]
+            
+            # Insert into database in a single unordered bulk round-trip
+            await self.db.bounties.bulk_write(
+                [InsertOne(doc) for doc in bounty_docs], ordered=False
+            )
             
             # Verify bounties are isolated by guild
             for i, guild_data in enumerate(self.test_guilds):
@@ -420,14 +460,15 @@ class MultiGuildTestSuite:
                 self._record_result("claim_bounty", claim_result is True,
                                   "Failed to claim bounty")
                 
-                # Verify the bounty is claimed
-                # Get the bounty again to make sure it's updated
-                bounty_id = target_bounty.bounty_id
-                bounty_doc = await self.db.bounties.find_one({"bounty_id": bounty_id})
-                claimed_bounty = Bounty.from_document(bounty_doc)
+                # Verify the claim was stored; claim() sets status on the
+                # object before writing, so only the database can tell
+                stored_bounty = await self.db.bounties.find_one(
+                    {"bounty_id": target_bounty.bounty_id}, {"status": 1, "_id": 0}
+                )
+                stored_status = stored_bounty.get("status") if stored_bounty else None
                 
-                self._record_result("bounty_claimed_status", claimed_bounty.status == Bounty.STATUS_CLAIMED,
-                                  f"Bounty should be claimed, got {claimed_bounty.status}")
+                self._record_result("bounty_claimed_status", stored_status == Bounty.STATUS_CLAIMED,
+                                  f"Bounty should be claimed, got {stored_status}")
                 
                 # Verify other guild bounties are unaffected
                 for guild_data in self.test_guilds[1:]:
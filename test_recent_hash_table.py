@@ -0,0 +1,109 @@
+"""
+Test the RecentHashTable used for event deduplication
+
+This script checks RecentHashTable in utils/parser_utils.py against a simple
+OrderedDict model of "the most recent N distinct hashes", including keys that
+collide in their low bits and probe chains that wrap around the table.
+"""
+
+import logging
+import random
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class RecentHashModel:
+    """Reference model: the last `capacity` distinct keys in insertion order"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.keys = OrderedDict()
+
+    def check_and_add(self, key):
+        key = key or 1
+        if key in self.keys:
+            return True
+        if len(self.keys) == self.capacity:
+            self.keys.popitem(last=False)
+        self.keys[key] = None
+        return False
+
+def check_against_model(capacity, keys):
+    """Feed keys to a table and the model and compare every answer"""
+    from utils.parser_utils import RecentHashTable
+
+    table = RecentHashTable(capacity)
+    model = RecentHashModel(capacity)
+    for step, key in enumerate(keys):
+        expected = model.check_and_add(key)
+        assert table.check_and_add(key) == expected, f"step {step}: key {key:#x} should be seen={expected}"
+        # Every remembered key must still be found after the evictions
+        for remembered in model.keys:
+            assert remembered in table, f"step {step}: lost key {remembered:#x}"
+    return table, model
+
+def test_random_keys():
+    """Random 64-bit keys with frequent repeats"""
+    rng = random.Random(1234)
+    pool = [rng.getrandbits(64) for _ in range(64)]
+    for capacity in (1, 2, 3, 7, 16):
+        keys = [rng.choice(pool) for _ in range(2000)]
+        check_against_model(capacity, keys)
+        logger.info(f"Random keys match the model at capacity {capacity}")
+
+def test_colliding_low_bits():
+    """Keys that share their low bits all hash to the same home slot"""
+    rng = random.Random(42)
+    pool = [(high << 32) | 0x5 for high in range(1, 40)]
+    for capacity in (1, 4, 10, 25):
+        keys = [rng.choice(pool) for _ in range(2000)]
+        check_against_model(capacity, keys)
+        logger.info(f"Colliding keys match the model at capacity {capacity}")
+
+def test_wraparound():
+    """Keys homed in the last slots, so probe chains wrap to the start"""
+    from utils.parser_utils import RecentHashTable
+
+    rng = random.Random(7)
+    for capacity in (3, 10, 30):
+        mask = RecentHashTable(capacity)._mask
+        pool = [(high << 32) | (mask - rng.randrange(2)) for high in range(1, 3 * capacity)]
+        keys = [rng.choice(pool) for _ in range(2000)]
+        check_against_model(capacity, keys)
+        logger.info(f"Wrapping probe chains match the model at capacity {capacity}")
+
+def test_zero_key():
+    """Key 0 marks an empty slot, so it is stored as 1"""
+    table, _ = check_against_model(2, [0, 0, 1, 2, 0])
+    assert 0 in table and 1 in table
+
+def test_capacity_validation():
+    """The table always keeps an empty slot and rejects empty capacities"""
+    from utils.parser_utils import RecentHashTable
+
+    for capacity in (1, 2, 3, 4, 5, 100):
+        assert RecentHashTable(capacity)._mask + 1 > capacity
+    for capacity in (0, -1):
+        try:
+            RecentHashTable(capacity)
+        except ValueError:
+            continue
+        raise AssertionError(f"capacity {capacity} should be rejected")
+
+def main():
+    """Run all tests"""
+    logger.info("Testing RecentHashTable...")
+
+    test_random_keys()
+    test_colliding_low_bits()
+    test_wraparound()
+    test_zero_key()
+    test_capacity_validation()
+
+    logger.info("All tests completed")
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ with various inputs to ensure they handle all edge cases correctly.
 """
 
 import asyncio
+import copy
 import logging
 from typing import Dict, Any, Optional, List, Union
 
@@ -14,49 +15,193 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# A guild with servers stored in every format the bot has used
+TEST_GUILD = {
+    "guild_id": "123456789",
+    "name": "Test Guild",
+    # Format 1: Traditional servers array with objects
+    "servers": [
+        {
+            "server_id": "1001",
+            "name": "Server 1001",
+            "platform": "steam"
+        },
+        {
+            "server_id": "1002",
+            "name": "Server 1002",
+            "platform": "xbox"
+        }
+    ],
+    # Format 2: Data object with servers
+    "data": {
+        "servers": [
+            {
+                "server_id": "2001",
+                "name": "Server 2001",
+                "platform": "psn"
+            },
+            "3001"  # Format 3: Simple string server ID
+        ]
+    },
+    # Format 4: Simple array of server IDs
+    "server_ids": ["4001", "4002"]
+}
+
+# A guild stored with an int guild_id whose servers carry connection settings,
+# plus a stray bare ID and a null entry in the servers array
+CONFIGURED_GUILD = {
+    "guild_id": 555,
+    "servers": [
+        {
+            "server_id": 5001,
+            "sftp_host": "sftp.example.com",
+            "sftp_port": 22,
+            "sftp_username": "user",
+            "sftp_password": "secret"
+        },
+        {
+            "server_id": "5002",
+            "sftp_host": "",
+            "sftp_port": 22
+        },
+        "5003",
+        None
+    ]
+}
+
+def _get_path(value, path):
+    """Follow a dotted field path, returning None where it is missing"""
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def _evaluate(expr, doc, variables):
+    """Evaluate the aggregation expressions the server lookups use"""
+    if isinstance(expr, str) and expr.startswith("$$"):
+        name, _, path = expr[2:].partition(".")
+        return _get_path(variables[name], path) if path else variables[name]
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _get_path(doc, expr[1:])
+    if isinstance(expr, list):
+        return [_evaluate(item, doc, variables) for item in expr]
+    if not isinstance(expr, dict):
+        return expr
+
+    if "$ifNull" in expr:
+        value, default = expr["$ifNull"]
+        value = _evaluate(value, doc, variables)
+        return _evaluate(default, doc, variables) if value is None else value
+    if "$or" in expr:
+        return any(_evaluate(cond, doc, variables) for cond in expr["$or"])
+    if "$in" in expr:
+        value, values = _evaluate(expr["$in"], doc, variables)
+        return value in values
+    if "$not" in expr:
+        return not _evaluate(expr["$not"][0], doc, variables)
+    if "$toString" in expr:
+        value = _evaluate(expr["$toString"], doc, variables)
+        return None if value is None else str(value)
+    if "$objectToArray" in expr:
+        value = _evaluate(expr["$objectToArray"], doc, variables)
+        if not isinstance(value, dict):
+            # MongoDB fails the whole aggregation here
+            raise TypeError(f"$objectToArray requires a document input, found: {value!r}")
+        return [{"k": key, "v": item} for key, item in value.items()]
+    if "$setDifference" in expr:
+        first, second = _evaluate(expr["$setDifference"], doc, variables)
+        return list(dict.fromkeys(item for item in first if item not in second))
+    if "$map" in expr:
+        spec = expr["$map"]
+        return [
+            _evaluate(spec["in"], doc, {**variables, spec["as"]: item})
+            for item in _evaluate(spec["input"], doc, variables) or []
+        ]
+    if "$filter" in expr:
+        spec = expr["$filter"]
+        return [
+            item for item in _evaluate(spec["input"], doc, variables) or []
+            if _evaluate(spec["cond"], doc, {**variables, spec["as"]: item})
+        ]
+    # Anything else is a sub-document of expressions
+    return {key: _evaluate(value, doc, variables) for key, value in expr.items()}
+
+def _matches(doc, query):
+    """Check a document against a find/$match query"""
+    for field, condition in query.items():
+        value = _get_path(doc, field)
+        if isinstance(condition, dict) and "$in" in condition:
+            if value not in condition["$in"]:
+                return False
+        elif isinstance(condition, dict) and "$type" in condition:
+            if condition["$type"] != "object" or not isinstance(value, dict):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+class MockCursor:
+    """Mock Motor cursor over a list of documents"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs[:length] if length is not None else list(self.docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
 class MockDB:
     """Mock database for testing"""
     
     def __init__(self):
         """Initialize mock database with guilds collection"""
         self.guilds = self  # Make guilds attribute point to self for chaining
+        self.documents = [TEST_GUILD, CONFIGURED_GUILD]
     
-    async def find_one(self, query):
+    async def find_one(self, query, projection=None):
         """Mock find_one method that returns test data"""
-        if 'guild_id' in query and query['guild_id'] == '123456789':
-            # Return a mock guild with different server storage formats
-            return {
-                "guild_id": "123456789",
-                "name": "Test Guild",
-                # Format 1: Traditional servers array with objects
-                "servers": [
-                    {
-                        "server_id": "1001",
-                        "name": "Server 1001",
-                        "platform": "steam"
-                    },
-                    {
-                        "server_id": "1002",
-                        "name": "Server 1002",
-                        "platform": "xbox"
-                    }
-                ],
-                # Format 2: Data object with servers
-                "data": {
-                    "servers": [
-                        {
-                            "server_id": "2001",
-                            "name": "Server 2001",
-                            "platform": "psn"
-                        },
-                        "3001"  # Format 3: Simple string server ID
-                    ]
-                },
-                # Format 4: Simple array of server IDs
-                "server_ids": ["4001", "4002"]
-            }
+        for doc in self.documents:
+            if _matches(doc, query):
+                # Lookups normalize documents in place, so hand out copies
+                return copy.deepcopy(doc)
         return None
 
+    def find(self, query, projection=None):
+        """Mock find method that returns a cursor over matching documents"""
+        return MockCursor([copy.deepcopy(doc) for doc in self.documents if _matches(doc, query)])
+
+    def aggregate(self, pipeline):
+        """Mock aggregate method that runs the stages the lookups use"""
+        docs = copy.deepcopy(self.documents)
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [doc for doc in docs if _matches(doc, stage["$match"])]
+            elif "$limit" in stage:
+                docs = docs[:stage["$limit"]]
+            elif "$unwind" in stage:
+                field = stage["$unwind"][1:]
+                docs = [
+                    {**doc, field: item}
+                    for doc in docs
+                    for item in (doc.get(field) if isinstance(doc.get(field), list) else [doc.get(field)])
+                    if item is not None
+                ]
+            elif "$project" in stage:
+                docs = [
+                    {key: _evaluate(value, doc, {}) for key, value in stage["$project"].items() if key != "_id"}
+                    for doc in docs
+                ]
+            else:
+                raise NotImplementedError(f"Unsupported pipeline stage: {stage}")
+        return MockCursor(docs)
+
 async def test_check_server_exists():
     """Test check_server_exists function with various inputs"""
     from utils.server_utils import check_server_exists
@@ -96,6 +241,9 @@ async def test_check_server_exists():
     result8 = await check_server_exists(db, guild_id, 1001)
     logger.info(f"Server 1001 (numeric) exists: {result8}")
 
+    assert [result1, result2, result3, result4, result8] == [True] * 5
+    assert not (result5 or result6 or result7)
+
 async def test_get_server_by_id():
     """Test get_server_by_id function with various inputs"""
     from utils.server_utils import get_server_by_id
@@ -123,6 +271,10 @@ async def test_get_server_by_id():
     result5 = await get_server_by_id(db, guild_id, "9999")
     logger.info(f"Server 9999 data: {result5}")
 
+    assert result1["platform"] == "steam" and result2["platform"] == "psn"
+    assert result3["server_id"] == "3001" and result4["server_id"] == "4001"
+    assert result5 is None
+
 async def test_get_all_servers():
     """Test get_all_servers function"""
     from utils.server_utils import get_all_servers
@@ -142,6 +294,9 @@ async def test_get_all_servers():
     servers2 = await get_all_servers(db, "999999")
     logger.info(f"Found {len(servers2)} servers for non-existent guild")
 
+    assert sorted(server_ids) == ["1001", "1002", "2001", "3001", "4001", "4002"]
+    assert len(servers2) == 0
+
 async def test_validate_server_config():
     """Test validate_server_config function"""
     from utils.server_utils import validate_server_config
@@ -161,6 +316,107 @@ async def test_validate_server_config():
     result3 = await validate_server_config(db, guild_id, "9999")
     logger.info(f"Server 9999 validation: exists={result3['exists']}, error={result3['error']}")
 
+    assert result1["exists"] and "sftp_host" in result1["missing_fields"]
+    assert result2["exists"] and not result2["valid"]
+    assert not result3["exists"]
+
+async def test_validate_guild_servers():
+    """Test validate_guild_servers against servers with and without settings"""
+    from utils.server_utils import validate_guild_servers
+    
+    db = MockDB()
+    
+    # Bare IDs and nulls in the servers array must be skipped, not break the query
+    reports = await validate_guild_servers(db, "555")
+    logger.info(f"Guild 555 reports: {reports}")
+    
+    assert set(reports) == {"5001", "5002"}
+    assert reports["5001"]["valid"] and not reports["5001"]["missing_fields"]
+    assert reports["5002"]["missing_fields"] == ["sftp_host", "sftp_username", "sftp_password"]
+    
+    # Guild whose servers have no connection settings
+    reports2 = await validate_guild_servers(db, "123456789")
+    logger.info(f"Guild 123456789 reports: {reports2}")
+    assert set(reports2) == {"1001", "1002"}
+    assert not any(report["valid"] for report in reports2.values())
+    
+    # Non-existent guild
+    reports3 = await validate_guild_servers(db, "999999")
+    logger.info(f"Guild 999999 reports: {reports3}")
+    assert reports3 == {}
+
+async def test_check_servers_exist_bulk():
+    """Test check_servers_exist_bulk across several guilds at once"""
+    from utils.server_utils import check_servers_exist_bulk
+    
+    db = MockDB()
+    
+    results = await check_servers_exist_bulk(db, [
+        ("555", "5001"),
+        (555, 5003),  # Stray bare ID in the servers array
+        ("555", "9999"),
+        ("123456789", "3001"),
+        ("999999", "1001")
+    ])
+    logger.info(f"Bulk results: {results}")
+    
+    assert results == {
+        ("555", "5001"): True,
+        ("555", "5003"): True,
+        ("555", "9999"): False,
+        ("123456789", "3001"): True,
+        ("999999", "1001"): False
+    }
+
+class SlowMockDB(MockDB):
+    """MockDB whose aggregate results are held back until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    def aggregate(self, pipeline):
+        # The pipeline runs now, against the documents as they are
+        cursor = super().aggregate(pipeline)
+        self.started.set()
+        release = self.release
+
+        class SlowCursor(MockCursor):
+            async def to_list(self, length=None):
+                await release.wait()
+                return await super().to_list(length)
+
+        return SlowCursor(cursor.docs)
+
+async def test_invalidate_during_lookup():
+    """Test that a lookup in flight across invalidate_server is not cached"""
+    from utils.server_utils import get_server, invalidate_server
+    
+    db = SlowMockDB()
+    
+    # Start a lookup that reads the guild before its server is added
+    stale = asyncio.ensure_future(get_server(db, "7001", "777"))
+    await db.started.wait()
+    
+    db.documents.append({"guild_id": "777", "servers": [{"server_id": "7001", "name": "Server 7001"}]})
+    invalidate_server("7001", "777")
+    
+    # A caller arriving after the write must not join the old query
+    fresh = asyncio.ensure_future(get_server(db, "7001", "777"))
+    await asyncio.sleep(0)
+    db.release.set()
+    
+    stale_result, fresh_result = await asyncio.gather(stale, fresh)
+    logger.info(f"Lookup across the write: {stale_result}, after it: {fresh_result}")
+    assert stale_result is None
+    assert fresh_result is not None and fresh_result["name"] == "Server 7001"
+    
+    # The pre-write miss must not have been cached
+    result = await get_server(db, "7001", "777")
+    logger.info(f"Server 7001 after invalidation: {result}")
+    assert result is not None
+
 async def main():
     """Run all tests"""
     logger.info("Testing server validation utilities...")
@@ -178,6 +434,15 @@ async def main():
     await test_validate_server_config()
     logger.info("-" * 50)
     
+    await test_validate_guild_servers()
+    logger.info("-" * 50)
+    
+    await test_check_servers_exist_bulk()
+    logger.info("-" * 50)
+    
+    await test_invalidate_during_lookup()
+    logger.info("-" * 50)
+    
     logger.info("All tests completed")
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+"""
+Test that the batched card shuffle is uniform
+
+This script checks _shuffled in utils/gambling.py. With a narrow random word
+every possible word can be tried, so exact uniformity of the Lemire batched
+Fisher-Yates is checked directly; full-width shuffles are then checked with
+chi-square tests on permutation and position frequencies.
+"""
+
+import itertools
+import logging
+import math
+from collections import Counter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class Rejected(Exception):
+    """Raised when a shuffle asks for a second random word"""
+
+class OneWordRNG:
+    """RNG stand-in that supplies a single fixed random word"""
+
+    def __init__(self, word):
+        self.words = iter([word])
+
+    def getrandbits(self, bits):
+        for word in self.words:
+            return word
+        raise Rejected()
+
+def chi_square_limit(df, z=3.09):
+    """Approximate chi-square critical value at p = 0.001 (Wilson-Hilferty)"""
+    return df * (1 - 2 / (9 * df) + z * math.sqrt(2 / (9 * df))) ** 3
+
+def chi_square(counts, expected):
+    """Pearson chi-square statistic of counts against a uniform expectation"""
+    return sum((count - expected) ** 2 / expected for count in counts)
+
+def test_exact_uniformity_with_narrow_words():
+    """Every permutation comes from the same number of accepted words"""
+    from utils import gambling
+
+    saved = (gambling._RNG, gambling._SHUFFLE_BITS, gambling._SHUFFLE_MASK)
+    try:
+        for bits, n in ((5, 3), (7, 4), (10, 5)):
+            gambling._SHUFFLE_BITS = bits
+            gambling._SHUFFLE_MASK = (1 << bits) - 1
+            gambling._shuffle_threshold.cache_clear()
+
+            permutations = Counter()
+            rejected = 0
+            for word in range(1 << bits):
+                gambling._RNG = OneWordRNG(word)
+                try:
+                    permutations[tuple(gambling._shuffled(range(n)))] += 1
+                except Rejected:
+                    rejected += 1
+
+            assert set(permutations) == set(itertools.permutations(range(n)))
+            assert len(set(permutations.values())) == 1, f"n={n}: {permutations}"
+            assert rejected == gambling._shuffle_threshold(n)
+            logger.info(f"{bits}-bit words give all {math.factorial(n)} orders of {n} items equally often")
+    finally:
+        gambling._RNG, gambling._SHUFFLE_BITS, gambling._SHUFFLE_MASK = saved
+        gambling._shuffle_threshold.cache_clear()
+
+def test_permutation_frequencies():
+    """Full-width shuffles of a few items hit every order equally often"""
+    from utils import gambling
+
+    gambling._RNG.seed(12345)
+    for n in (3, 4, 5):
+        trials = 200 * math.factorial(n)
+        permutations = Counter(tuple(gambling._shuffled(range(n))) for _ in range(trials))
+        assert len(permutations) == math.factorial(n)
+        statistic = chi_square(permutations.values(), trials / math.factorial(n))
+        logger.info(f"Permutations of {n} items: chi-square {statistic:.1f}")
+        assert statistic < chi_square_limit(math.factorial(n) - 1)
+
+def test_deck_positions():
+    """In a 52-card shuffle each card is equally likely in every position"""
+    from utils import gambling
+
+    gambling._RNG.seed(54321)
+    trials = 10400
+    positions = [Counter() for _ in range(52)]
+    for _ in range(trials):
+        for position, card in enumerate(gambling._shuffled(range(52))):
+            positions[card][position] += 1
+
+    limit = chi_square_limit(51)
+    for card in (0, 1, 25, 51):
+        counts = [positions[card][position] for position in range(52)]
+        statistic = chi_square(counts, trials / 52)
+        logger.info(f"Positions of card {card}: chi-square {statistic:.1f}")
+        assert statistic < limit
+
+def main():
+    """Run all tests"""
+    logger.info("Testing shuffle uniformity...")
+
+    test_exact_uniformity_with_narrow_words()
+    test_permutation_frequencies()
+    test_deck_positions()
+
+    logger.info("All tests completed")
+
+if __name__ == "__main__":
+    main()
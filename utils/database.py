@@ -14,8 +14,10 @@ from bson import ObjectId
 
 logger = logging.getLogger(__name__)
 
-# Global database manager instance
+# Global database manager instance, shared by every caller of get_db so
+# there is one client and one connection pool per process
 _db_manager = None
+_db_manager_lock = asyncio.Lock()
 
 async def initialize_db():
     """Initialize the database connection
@@ -26,9 +28,13 @@ async def initialize_db():
     global _db_manager
     
     if _db_manager is None:
-        logger.info("Initializing database manager")
-        _db_manager = DatabaseManager()
-        await _db_manager.initialize()
+        # Concurrent first callers must not each open a client
+        async with _db_manager_lock:
+            if _db_manager is None:
+                logger.info("Initializing database manager")
+                db_manager = DatabaseManager()
+                await db_manager.initialize()
+                _db_manager = db_manager
     
     return _db_manager
     
@@ -50,6 +56,14 @@ async def get_db():
         
     return _db_manager
 
+async def close_db():
+    """Close the shared database connection, if one was opened"""
+    global _db_manager
+    
+    if _db_manager is not None:
+        await _db_manager.disconnect()
+        _db_manager = None
+
 class DatabaseManager:
     """MongoDB database connection manager"""
     
@@ -97,7 +111,10 @@ class DatabaseManager:
             self._client = motor.motor_asyncio.AsyncIOMotorClient(
                 self.connection_string,
                 serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000
+                connectTimeoutMS=5000,
+                maxPoolSize=50,                 # Connection pool size
+                minPoolSize=5,                  # Keep a few warm connections
+                maxIdleTimeMS=300000            # Drop connections idle for 5 minutes
             )
             
             # Test connection
@@ -7,7 +7,9 @@ validation to ensure all required variables are set.
 import os
 import logging
 import sys
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Mapping
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -38,11 +40,7 @@ def validate_environment() -> bool:
     Returns:
         bool: True if all required variables are set, False otherwise
     """
-    missing_vars = []
-    
-    for var_name in REQUIRED_VARS:
-        if not os.environ.get(var_name):
-            missing_vars.append(var_name)
+    missing_vars = find_missing_vars(os.environ)
     
     if missing_vars:
         logger.critical(f"Missing required environment variables: {', '.join(missing_vars)}")
@@ -58,6 +56,20 @@ def validate_environment() -> bool:
     
     return True
 
+def find_missing_vars(env: Optional[Mapping[str, str]] = None) -> List[str]:
+    """
+    Find required environment variables that are unset or empty.
+    
+    Args:
+        env: Environment to check (defaults to the cached snapshot)
+        
+    Returns:
+        List[str]: Names of the missing variables, in REQUIRED_VARS order
+    """
+    if env is None:
+        env = get_env_snapshot()
+    return [var_name for var_name in REQUIRED_VARS if not env.get(var_name)]
+
 def get_env_var(name: str, default: Optional[Any] = None) -> Any:
     """
     Get environment variable with optional default.
@@ -71,6 +83,19 @@ def get_env_var(name: str, default: Optional[Any] = None) -> Any:
     """
     return os.environ.get(name, default)
 
+@lru_cache(maxsize=1)
+def get_env_snapshot() -> Mapping[str, str]:
+    """
+    Get a read-only snapshot of the environment, including .env values.
+    
+    The snapshot is taken once, so it is meant for one-shot checks such as
+    the startup validators; use get_env_var where values may change.
+    
+    Returns:
+        Mapping[str, str]: Environment variables at first call
+    """
+    return MappingProxyType(dict(os.environ))
+
 def get_debug_mode() -> bool:
     """
     Get debug mode setting from environment.
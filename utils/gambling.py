@@ -3,58 +3,92 @@ Gambling utilities for blackjack, slots, and roulette games
 """
 import random
 import asyncio
+import bisect
+import itertools
 import logging
-from enum import Enum, auto
-from typing import List, Dict, Any, Tuple, Optional, Union
+import math
+from collections import Counter, deque
+from enum import Enum, IntEnum, auto
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Optional, Union, Sequence
 import discord
 from discord.ui import View, Button, Select
 from discord import ButtonStyle, SelectOption
 
 logger = logging.getLogger(__name__)
 
+# Dedicated generator for all game draws, independent of the shared module-level random state
+_RNG = random.Random()
+
+# Width of the random word that supplies every swap index of a shuffle (2**256 > 52!)
+_SHUFFLE_BITS = 256
+_SHUFFLE_MASK = (1 << _SHUFFLE_BITS) - 1
+
+@lru_cache(maxsize=None)
+def _shuffle_threshold(n: int) -> Optional[int]:
+    """Rejection threshold for a batched shuffle of n items, or None if n! needs more bits"""
+    bound = math.factorial(n)
+    if bound > _SHUFFLE_MASK:
+        return None
+    return ((1 << _SHUFFLE_BITS) - bound) % bound
+
+def _shuffled(items: Sequence) -> list:
+    """Return a uniformly shuffled copy of items
+    
+    Fisher-Yates with batched bounded draws (Lemire): a single random word is
+    multiplied by each bound in turn, the high bits giving the swap index, so
+    the whole shuffle costs one RNG call and no divisions. The final leftover
+    is checked against the threshold to keep the result exactly uniform.
+    """
+    shuffled = list(items)
+    n = len(shuffled)
+    threshold = _shuffle_threshold(n)
+    if threshold is None:
+        _RNG.shuffle(shuffled)
+        return shuffled
+    
+    while True:
+        word = _RNG.getrandbits(_SHUFFLE_BITS)
+        indices = []
+        for bound in range(n, 1, -1):
+            word *= bound
+            indices.append(word >> _SHUFFLE_BITS)
+            word &= _SHUFFLE_MASK
+        if word >= threshold:
+            break
+    
+    for i, j in zip(range(n - 1, 0, -1), indices):
+        shuffled[i], shuffled[j] = shuffled[j], shuffled[i]
+    return shuffled
+
 class CardSuit(Enum):
     HEARTS = auto()
     DIAMONDS = auto()
     CLUBS = auto()
     SPADES = auto()
 
+# Per-rank lookup tables indexed by Card.value (1 = Ace ... 13 = King)
+_BLACKJACK_VALUES = (0, 11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+_DISPLAY_VALUES = ("", "A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+
+_SUIT_EMOJI = {
+    CardSuit.HEARTS: "♥️",
+    CardSuit.DIAMONDS: "♦️",
+    CardSuit.CLUBS: "♣️",
+    CardSuit.SPADES: "♠️"
+}
+
 class Card:
     def __init__(self, suit: CardSuit, value: int):
         self.suit = suit
         self.value = value
-    
-    @property
-    def display_value(self) -> str:
-        if self.value == 1:
-            return "A"
-        elif self.value == 11:
-            return "J"
-        elif self.value == 12:
-            return "Q"
-        elif self.value == 13:
-            return "K"
-        else:
-            return str(self.value)
-    
-    @property
-    def blackjack_value(self) -> int:
-        if self.value == 1:
-            return 11  # Ace is 11 by default, can be 1 if needed
-        elif self.value >= 10:
-            return 10  # Face cards are worth 10
-        else:
-            return self.value
-    
-    @property
-    def emoji(self) -> str:
-        """Return the card emoji"""
-        suits = {
-            CardSuit.HEARTS: "♥️",
-            CardSuit.DIAMONDS: "♦️",
-            CardSuit.CLUBS: "♣️",
-            CardSuit.SPADES: "♠️"
-        }
-        return f"{suits[self.suit]}{self.display_value}"
+        # Ace is 11 by default (can be 1 if needed), face cards are worth 10
+        self.blackjack_value = _BLACKJACK_VALUES[value]
+        self.display_value = _DISPLAY_VALUES[value]
+        self.emoji = f"{_SUIT_EMOJI[suit]}{self.display_value}"
+
+# Cards are never mutated after creation, so every deck shares the same 52 instances
+_DECK_TEMPLATE = [Card(suit, value) for suit in CardSuit for value in range(1, 14)]
 
 class Deck:
     def __init__(self):
@@ -63,15 +97,11 @@ class Deck:
     
     def reset(self):
         """Reset the deck with all 52 cards"""
-        self.cards = []
-        for suit in CardSuit:
-            for value in range(1, 14):
-                self.cards.append(Card(suit, value))
-        self.shuffle()
+        self.cards = _shuffled(_DECK_TEMPLATE)
     
     def shuffle(self):
         """Shuffle the deck"""
-        random.shuffle(self.cards)
+        self.cards = _shuffled(self.cards)
     
     def deal(self) -> Card:
         """Deal a card from the deck"""
@@ -80,29 +110,78 @@ class Deck:
         return self.cards.pop()
 
 class BlackjackGame:
-    def __init__(self, player_id: str):
-        self.player_id = player_id
+    def __init__(self, player_id: Union[int, str]):
+        self.player_id = int(player_id)  # Compared directly against interaction.user.id
         self.deck = Deck()
         self.player_hand = []
         self.dealer_hand = []
+        # Running hand totals, updated as each card is dealt
+        self.player_total = 0
+        self.player_aces = 0
+        self.dealer_total = 0
+        self.dealer_aces = 0
+        # Rendered hands, extended as each card is dealt
+        self.player_hand_str = ""
+        self.dealer_hand_str = ""
+        self.dealer_upcard = []  # Dealer hand as shown before the reveal
         self.game_over = False
         self.bet = 0
         self.result = ""
         self.message = None
+        # State dict returned by get_game_state, updated in place on every call
+        self._state = {}
+    
+    @staticmethod
+    def _add_card(total: int, aces: int, card: Card) -> Tuple[int, int]:
+        """Add a card to a running hand total, demoting aces from 11 to 1 while bust
+        
+        Returns:
+            Tuple of (new total, number of aces still counted as 11)
+        """
+        total += card.blackjack_value
+        if card.value == 1:
+            aces += 1
+        while total > 21 and aces > 0:
+            total -= 10
+            aces -= 1
+        return total, aces
+    
+    def _deal_to_player(self):
+        """Deal a card to the player and update the running total"""
+        card = self.deck.deal()
+        self.player_hand.append(card)
+        self.player_hand_str = f"{self.player_hand_str} {card.emoji}" if self.player_hand_str else card.emoji
+        self.player_total, self.player_aces = self._add_card(self.player_total, self.player_aces, card)
+    
+    def _deal_to_dealer(self):
+        """Deal a card to the dealer and update the running total"""
+        card = self.deck.deal()
+        self.dealer_hand.append(card)
+        if len(self.dealer_hand) == 1:
+            self.dealer_upcard = [card]
+        self.dealer_hand_str = f"{self.dealer_hand_str} {card.emoji}" if self.dealer_hand_str else card.emoji
+        self.dealer_total, self.dealer_aces = self._add_card(self.dealer_total, self.dealer_aces, card)
     
     def start_game(self, bet: int):
         """Start a new game of blackjack"""
         self.bet = bet
-        self.player_hand = [self.deck.deal(), self.deck.deal()]
-        self.dealer_hand = [self.deck.deal(), self.deck.deal()]
+        self.player_hand = []
+        self.dealer_hand = []
+        self.player_total = self.player_aces = 0
+        self.dealer_total = self.dealer_aces = 0
+        self.player_hand_str = self.dealer_hand_str = ""
+        self._deal_to_player()
+        self._deal_to_player()
+        self._deal_to_dealer()
+        self._deal_to_dealer()
         self.game_over = False
         self.result = ""
         return self.get_game_state()
     
     def get_game_state(self, reveal_dealer: bool = False) -> Dict[str, Any]:
         """Get the current game state"""
-        player_value = self.calculate_hand_value(self.player_hand)
-        dealer_value = self.calculate_hand_value(self.dealer_hand)
+        player_value = self.player_total
+        dealer_value = self.dealer_total
         
         # Check if player has blackjack
         player_blackjack = len(self.player_hand) == 2 and player_value == 21
@@ -118,47 +197,35 @@ class BlackjackGame:
             elif dealer_blackjack:
                 self.result = "dealer_blackjack"
         
-        return {
-            "player_hand": self.player_hand,
-            "dealer_hand": self.dealer_hand if reveal_dealer else [self.dealer_hand[0]],
-            "player_value": player_value,
-            "dealer_value": dealer_value if reveal_dealer else self.dealer_hand[0].blackjack_value,
-            "game_over": self.game_over,
-            "result": self.result,
-            "bet": self.bet,
-            "reveal_dealer": reveal_dealer,
-            "player_blackjack": player_blackjack,
-            "dealer_blackjack": dealer_blackjack
-        }
+        upcard = self.dealer_upcard[0]
+        
+        state = self._state
+        state["player_hand"] = self.player_hand
+        state["dealer_hand"] = self.dealer_hand if reveal_dealer else self.dealer_upcard
+        state["player_cards"] = self.player_hand_str
+        state["dealer_cards"] = self.dealer_hand_str if reveal_dealer else upcard.emoji
+        state["player_value"] = player_value
+        state["dealer_value"] = dealer_value if reveal_dealer else upcard.blackjack_value
+        state["game_over"] = self.game_over
+        state["result"] = self.result
+        state["bet"] = self.bet
+        state["reveal_dealer"] = reveal_dealer
+        state["player_blackjack"] = player_blackjack
+        state["dealer_blackjack"] = dealer_blackjack
+        return state
     
     def calculate_hand_value(self, hand: List[Card]) -> int:
         """Calculate the value of a hand, accounting for aces"""
-        value = 0
-        aces = 0
-        
-        for card in hand:
-            if card.value == 1:  # Ace
-                aces += 1
-                value += 11
-            else:
-                value += card.blackjack_value
-        
-        # Adjust for aces if over 21
-        while value > 21 and aces > 0:
-            value -= 10  # Convert an ace from 11 to 1
-            aces -= 1
-        
-        return value
+        return _hand_value([card.blackjack_value for card in hand])
     
     def hit(self) -> Dict[str, Any]:
         """Player takes another card"""
         if self.game_over:
             return self.get_game_state(True)
         
-        self.player_hand.append(self.deck.deal())
-        player_value = self.calculate_hand_value(self.player_hand)
+        self._deal_to_player()
         
-        if player_value > 21:
+        if self.player_total > 21:
             self.game_over = True
             self.result = "bust"
         
@@ -172,12 +239,11 @@ class BlackjackGame:
         self.game_over = True
         
         # Dealer draws until 17 or higher
-        dealer_value = self.calculate_hand_value(self.dealer_hand)
-        while dealer_value < 17:
-            self.dealer_hand.append(self.deck.deal())
-            dealer_value = self.calculate_hand_value(self.dealer_hand)
+        while self.dealer_total < 17:
+            self._deal_to_dealer()
         
-        player_value = self.calculate_hand_value(self.player_hand)
+        dealer_value = self.dealer_total
+        player_value = self.player_total
         
         if dealer_value > 21:
             self.result = "dealer_bust"
@@ -201,6 +267,193 @@ class BlackjackGame:
         else:  # All losses
             return -self.bet
 
+# Blackjack values of a full deck, used by the simulator instead of Card objects
+_DECK_BLACKJACK_VALUES = tuple(card.blackjack_value for card in _DECK_TEMPLATE)
+
+def _hand_value(values: List[int]) -> int:
+    """Total a hand of blackjack values, counting aces (11) as 1 while over 21"""
+    total = 0
+    aces = 0
+    for value in values:
+        total += value
+        if value == 11:
+            aces += 1
+    
+    # Adjust for aces if over 21
+    while total > 21 and aces > 0:
+        total -= 10  # Convert an ace from 11 to 1
+        aces -= 1
+    
+    return total
+
+def _draw_until(deck: List[int], position: int, total: int, aces: int, threshold: int) -> Tuple[int, int]:
+    """Draw from deck[position:] until the running total reaches threshold
+    
+    Returns:
+        Tuple of (final total, position of the next undealt card)
+    """
+    while total < threshold:
+        value = deck[position]
+        position += 1
+        total += value
+        if value == 11:
+            aces += 1
+        while total > 21 and aces:
+            total -= 10
+            aces -= 1
+    return total, position
+
+def simulate_blackjack(n_sims: int, stand_on: int = 17) -> Dict[str, float]:
+    """Estimate blackjack outcomes by Monte Carlo simulation
+    
+    Each round uses a freshly shuffled deck and the same rules as BlackjackGame:
+    naturals pay 3:2 and the dealer draws until 17 or higher.
+    
+    Args:
+        n_sims: Number of rounds to simulate
+        stand_on: Player hits while their hand total is below this value
+        
+    Returns:
+        Dict with win_rate, loss_rate, push_rate and expected_value per unit bet
+    """
+    wins = losses = pushes = 0
+    net = 0.0
+    
+    for _ in range(n_sims):
+        deck = _shuffled(_DECK_BLACKJACK_VALUES)
+        
+        # Deal two cards each, counting aces that are still worth 11
+        player_total = deck[0] + deck[1]
+        player_aces = (deck[0] == 11) + (deck[1] == 11)
+        dealer_total = deck[2] + deck[3]
+        dealer_aces = (deck[2] == 11) + (deck[3] == 11)
+        if player_total > 21:
+            player_total -= 10
+            player_aces -= 1
+        if dealer_total > 21:
+            dealer_total -= 10
+            dealer_aces -= 1
+        
+        # Natural blackjack
+        if player_total == 21 or dealer_total == 21:
+            if player_total == dealer_total:
+                pushes += 1
+            elif player_total == 21:
+                wins += 1
+                net += 1.5
+            else:
+                losses += 1
+                net -= 1
+            continue
+        
+        # Player draws until reaching the stand threshold
+        player_total, position = _draw_until(deck, 4, player_total, player_aces, stand_on)
+        
+        if player_total > 21:
+            losses += 1
+            net -= 1
+            continue
+        
+        # Dealer draws until 17 or higher
+        dealer_total, position = _draw_until(deck, position, dealer_total, dealer_aces, 17)
+        
+        if dealer_total > 21 or dealer_total < player_total:
+            wins += 1
+            net += 1
+        elif dealer_total > player_total:
+            losses += 1
+            net -= 1
+        else:
+            pushes += 1
+    
+    if n_sims <= 0:
+        return {"win_rate": 0.0, "loss_rate": 0.0, "push_rate": 0.0, "expected_value": 0.0}
+    
+    return {
+        "win_rate": wins / n_sims,
+        "loss_rate": losses / n_sims,
+        "push_rate": pushes / n_sims,
+        "expected_value": net / n_sims
+    }
+
+# Final dealer outcomes, in the order returned by dealer_outcome_probabilities
+DEALER_OUTCOMES = ("bust", 17, 18, 19, 20, 21)
+
+# Card counts for blackjack values 2-11 in a full deck
+_FULL_DECK_COMPOSITION = tuple(_DECK_BLACKJACK_VALUES.count(value) for value in range(2, 12))
+
+@lru_cache(maxsize=65536)
+def _dealer_distribution(total: int, aces: int, composition: Tuple[int, ...]) -> Tuple[float, ...]:
+    """Exact dealer outcome probabilities from a partial hand, memoized by deck composition
+    
+    Args:
+        total: Current dealer total
+        aces: Aces in the dealer hand still counted as 11
+        composition: Remaining card counts for blackjack values 2-11
+        
+    Returns:
+        Probabilities aligned with DEALER_OUTCOMES
+    """
+    if total >= 17:
+        outcome = 0 if total > 21 else total - 16
+        return tuple(1.0 if i == outcome else 0.0 for i in range(len(DEALER_OUTCOMES)))
+    
+    remaining = sum(composition)
+    probabilities = [0.0] * len(DEALER_OUTCOMES)
+    if remaining == 0:
+        return tuple(probabilities)
+    
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+        
+        value = index + 2
+        new_total = total + value
+        new_aces = aces + (value == 11)
+        while new_total > 21 and new_aces:
+            new_total -= 10
+            new_aces -= 1
+        
+        next_composition = composition[:index] + (count - 1,) + composition[index + 1:]
+        outcome = _dealer_distribution(new_total, new_aces, next_composition)
+        weight = count / remaining
+        for i, probability in enumerate(outcome):
+            probabilities[i] += weight * probability
+    
+    return tuple(probabilities)
+
+def dealer_outcome_probabilities(upcard: int, composition: Optional[Tuple[int, ...]] = None) -> Dict[Any, float]:
+    """Get the probability of each final dealer total given the dealer's upcard
+    
+    Results are cached by deck composition, so repeated queries for the same
+    remaining cards (e.g. across many player scenarios) are a dictionary lookup.
+    
+    Args:
+        upcard: Blackjack value of the dealer's face-up card (2-11)
+        composition: Remaining card counts for values 2-11, defaults to a full deck minus the upcard
+        
+    Returns:
+        Dict mapping each of DEALER_OUTCOMES to its probability
+        
+    Raises:
+        ValueError: If upcard is not 2-11 or composition does not have 10 counts
+    """
+    if not 2 <= upcard <= 11:
+        raise ValueError(f"upcard must be a blackjack value from 2 to 11, got {upcard}")
+    if composition is None:
+        index = upcard - 2
+        composition = (
+            _FULL_DECK_COMPOSITION[:index]
+            + (_FULL_DECK_COMPOSITION[index] - 1,)
+            + _FULL_DECK_COMPOSITION[index + 1:]
+        )
+    elif len(composition) != len(_FULL_DECK_COMPOSITION):
+        raise ValueError(f"composition must have {len(_FULL_DECK_COMPOSITION)} card counts, got {len(composition)}")
+    
+    aces = 1 if upcard == 11 else 0
+    distribution = _dealer_distribution(upcard, aces, tuple(composition))
+    return dict(zip(DEALER_OUTCOMES, distribution))
+
 class BlackjackView(View):
     def __init__(self, game: BlackjackGame, economy):
         super().__init__(timeout=300)  # 5 minutes timeout
@@ -221,7 +474,7 @@ class BlackjackView(View):
     @discord.ui.button(label="Hit", style=ButtonStyle.primary)
     async def hit_button(self, interaction: discord.Interaction, button: Button):
         # Check if it's the player's game
-        if str(interaction.user.id) != self.game.player_id:
+        if interaction.user.id != self.game.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
         
@@ -230,28 +483,14 @@ class BlackjackView(View):
         
         if game_state["game_over"]:
             self.disable_all_buttons()
-            payout = self.game.get_payout()
-            
-            # Update player economy
-            if payout > 0:
-                await self.economy.add_currency(payout, "blackjack", {"game": "blackjack", "result": self.game.result})
-                await self.economy.update_gambling_stats("blackjack", True, payout)
-                embed.add_field(name="Payout", value=f"You won {payout} credits!", inline=False)
-            elif payout < 0:
-                await self.economy.update_gambling_stats("blackjack", False, abs(payout))
-                embed.add_field(name="Loss", value=f"You lost {abs(payout)} credits.", inline=False)
-            else:  # push
-                embed.add_field(name="Push", value=f"Your bet of {self.game.bet} credits has been returned.", inline=False)
-            
-            new_balance = await self.economy.get_balance()
-            embed.add_field(name="New Balance", value=f"{new_balance} credits", inline=False)
+            await self._settle(embed)
         
         await interaction.response.edit_message(embed=embed, view=self if not game_state["game_over"] else None)
     
     @discord.ui.button(label="Stand", style=ButtonStyle.secondary)
     async def stand_button(self, interaction: discord.Interaction, button: Button):
         # Check if it's the player's game
-        if str(interaction.user.id) != self.game.player_id:
+        if interaction.user.id != self.game.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
         
@@ -259,12 +498,24 @@ class BlackjackView(View):
         embed = create_blackjack_embed(game_state)
         
         self.disable_all_buttons()
+        await self._settle(embed)
+        
+        await interaction.response.edit_message(embed=embed, view=None)
+    
+    async def _settle(self, embed: discord.Embed):
+        """Apply the finished game's payout and add the outcome to the embed
+        
+        Args:
+            embed: Game embed to add the payout and balance fields to
+        """
         payout = self.game.get_payout()
         
-        # Update player economy
+        # Update player economy (credit and stats are independent writes)
         if payout > 0:
-            await self.economy.add_currency(payout, "blackjack", {"game": "blackjack", "result": self.game.result})
-            await self.economy.update_gambling_stats("blackjack", True, payout)
+            await asyncio.gather(
+                self.economy.add_currency(payout, "blackjack", {"game": "blackjack", "result": self.game.result}),
+                self.economy.update_gambling_stats("blackjack", True, payout)
+            )
             embed.add_field(name="Payout", value=f"You won {payout} credits!", inline=False)
         elif payout < 0:
             await self.economy.update_gambling_stats("blackjack", False, abs(payout))
@@ -272,17 +523,32 @@ class BlackjackView(View):
         else:  # push
             embed.add_field(name="Push", value=f"Your bet of {self.game.bet} credits has been returned.", inline=False)
         
+        # Read the balance only after the payout has been written
         new_balance = await self.economy.get_balance()
         embed.add_field(name="New Balance", value=f"{new_balance} credits", inline=False)
-        
-        await interaction.response.edit_message(embed=embed, view=None)
     
     def disable_all_buttons(self):
         for item in self.children:
             item.disabled = True
 
+# Result messages shown when a blackjack game ends
+_BLACKJACK_RESULT_TEXT = {
+    "blackjack": "Blackjack! You win!",
+    "dealer_blackjack": "Dealer has Blackjack. You lose.",
+    "bust": "Bust! You went over 21.",
+    "dealer_bust": "Dealer busts! You win!",
+    "player_wins": "You win!",
+    "dealer_wins": "Dealer wins.",
+    "push": "Push! It's a tie."
+}
+
 def create_blackjack_embed(game_state: Dict[str, Any]) -> discord.Embed:
     """Create an embed for a blackjack game"""
+    player_cards = game_state["player_cards"]
+    dealer_cards = game_state["dealer_cards"]
+    dealer_value = game_state["dealer_value"]
+    result = game_state["result"]
+    
     embed = discord.Embed(
         title="Blackjack",
         description=f"Bet: {game_state['bet']} credits",
@@ -290,7 +556,6 @@ def create_blackjack_embed(game_state: Dict[str, Any]) -> discord.Embed:
     )
     
     # Player hand
-    player_cards = " ".join([card.emoji for card in game_state["player_hand"]])
     embed.add_field(
         name=f"Your Hand ({game_state['player_value']})",
         value=player_cards,
@@ -298,9 +563,6 @@ def create_blackjack_embed(game_state: Dict[str, Any]) -> discord.Embed:
     )
     
     # Dealer hand
-    dealer_cards = " ".join([card.emoji for card in game_state["dealer_hand"]])
-    dealer_value = game_state["dealer_value"]
-    
     if not game_state["reveal_dealer"]:
         dealer_name = f"Dealer's Hand (showing {dealer_value})"
     else:
@@ -310,62 +572,104 @@ def create_blackjack_embed(game_state: Dict[str, Any]) -> discord.Embed:
     
     # Game result
     if game_state["game_over"]:
-        result_text = ""
-        if game_state["result"] == "blackjack":
-            result_text = "Blackjack! You win!"
-        elif game_state["result"] == "dealer_blackjack":
-            result_text = "Dealer has Blackjack. You lose."
-        elif game_state["result"] == "bust":
-            result_text = "Bust! You went over 21."
-        elif game_state["result"] == "dealer_bust":
-            result_text = "Dealer busts! You win!"
-        elif game_state["result"] == "player_wins":
-            result_text = "You win!"
-        elif game_state["result"] == "dealer_wins":
-            result_text = "Dealer wins."
-        elif game_state["result"] == "push":
-            result_text = "Push! It's a tie."
-        
+        result_text = _BLACKJACK_RESULT_TEXT.get(result, "")
         embed.add_field(name="Result", value=result_text, inline=False)
     
     return embed
 
+# Roulette wheel numbers (European style with single 0)
+_WHEEL_NUMBERS = tuple(range(0, 37))  # 0-36
+
+# Roulette number properties, precomputed once and indexed by the winning number
+_RED_NUMBERS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+_BLACK_NUMBERS = frozenset(range(1, 37)) - _RED_NUMBERS
+
+# Bit n is set when number n is red
+_RED_MASK = 0
+for _number in _RED_NUMBERS:
+    _RED_MASK |= 1 << _number
+del _number
+
+NUMBER_COLOR = ("green",) + tuple("red" if n in _RED_NUMBERS else "black" for n in range(1, 37))
+NUMBER_DOZEN = (None,) + tuple(("1st", "2nd", "3rd")[(n - 1) // 12] for n in range(1, 37))
+NUMBER_COLUMN = (None,) + tuple(("3rd", "1st", "2nd")[n % 3] for n in range(1, 37))
+
+class BetType(IntEnum):
+    STRAIGHT = 0
+    SPLIT = 1
+    STREET = 2
+    CORNER = 3
+    SIX_LINE = 4
+    COLUMN = 5
+    DOZEN = 6
+    RED = 7
+    BLACK = 8
+    EVEN = 9
+    ODD = 10
+    LOW = 11
+    HIGH = 12
+
+# Bet type names as used in bet selections and results
+_BET_TYPE_BY_NAME = {bet_type.name.lower(): bet_type for bet_type in BetType}
+
+# Payout multipliers, indexed by BetType
+_BET_PAYOUTS = (35, 17, 11, 8, 5, 2, 2, 1, 1, 1, 1, 1, 1)
+
+# Win checks indexed by BetType: (winning number, bet value) -> won
+# Split, street, corner and six line bets are not offered and never win
+_BET_RESOLVERS = (
+    lambda result, bet_value: int(bet_value) == result,
+    None,
+    None,
+    None,
+    None,
+    lambda result, bet_value: result != 0 and NUMBER_COLUMN[result] == bet_value,
+    lambda result, bet_value: result != 0 and NUMBER_DOZEN[result] == bet_value,
+    lambda result, bet_value: (_RED_MASK >> result) & 1 == 1,
+    lambda result, bet_value: result != 0 and (_RED_MASK >> result) & 1 == 0,
+    lambda result, bet_value: result != 0 and result % 2 == 0,
+    lambda result, bet_value: result % 2 == 1,
+    lambda result, bet_value: 1 <= result <= 18,
+    lambda result, bet_value: 19 <= result <= 36
+)
+
 class RouletteGame:
     """Roulette game implementation"""
     
     # Roulette wheel numbers (European style with single 0)
-    WHEEL_NUMBERS = list(range(0, 37))  # 0-36
+    WHEEL_NUMBERS = _WHEEL_NUMBERS
     
     # Number colors
-    RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
-    BLACK_NUMBERS = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
+    RED_NUMBERS = _RED_NUMBERS
+    BLACK_NUMBERS = _BLACK_NUMBERS
     # 0 is green
     
-    # Bet types and payouts
+    # Bet type descriptions (payouts live in _BET_PAYOUTS)
     BET_TYPES = {
-        "straight": {"description": "Single number", "payout": 35},
-        "split": {"description": "Two adjacent numbers", "payout": 17},
-        "street": {"description": "Three numbers in a row", "payout": 11},
-        "corner": {"description": "Four numbers in a square", "payout": 8},
-        "six_line": {"description": "Six numbers (two rows)", "payout": 5},
-        "column": {"description": "12 numbers (a column)", "payout": 2},
-        "dozen": {"description": "12 numbers (1-12, 13-24, 25-36)", "payout": 2},
-        "red": {"description": "Red numbers", "payout": 1},
-        "black": {"description": "Black numbers", "payout": 1},
-        "even": {"description": "Even numbers", "payout": 1},
-        "odd": {"description": "Odd numbers", "payout": 1},
-        "low": {"description": "Low numbers (1-18)", "payout": 1},
-        "high": {"description": "High numbers (19-36)", "payout": 1}
+        "straight": "Single number",
+        "split": "Two adjacent numbers",
+        "street": "Three numbers in a row",
+        "corner": "Four numbers in a square",
+        "six_line": "Six numbers (two rows)",
+        "column": "12 numbers (a column)",
+        "dozen": "12 numbers (1-12, 13-24, 25-36)",
+        "red": "Red numbers",
+        "black": "Black numbers",
+        "even": "Even numbers",
+        "odd": "Odd numbers",
+        "low": "Low numbers (1-18)",
+        "high": "High numbers (19-36)"
     }
     
-    def __init__(self, player_id: str):
-        self.player_id = player_id
+    def __init__(self, player_id: Union[int, str]):
+        self.player_id = int(player_id)  # Compared directly against interaction.user.id
         self.message = None
         self.bet_amount = 0
         self.bet_type = None
+        self.bet_kind = None  # BetType for bet_type
         self.bet_value = None
         self.last_result = None
-        self.history = []  # Last 10 spins
+        self.history = deque(maxlen=10)  # Last 10 spins
     
     def place_bet(self, amount: int, bet_type: str, bet_value: Any) -> bool:
         """Place a bet on the roulette table
@@ -378,11 +682,13 @@ class RouletteGame:
         Returns:
             True if bet was placed successfully, False otherwise
         """
-        if bet_type not in self.BET_TYPES:
+        bet_kind = _BET_TYPE_BY_NAME.get(bet_type)
+        if bet_kind is None:
             return False
             
         self.bet_amount = amount
         self.bet_type = bet_type
+        self.bet_kind = bet_kind
         self.bet_value = bet_value
         return True
     
@@ -393,80 +699,21 @@ class RouletteGame:
             Result data dictionary
         """
         # Randomly select a number
-        result = random.choice(self.WHEEL_NUMBERS)
+        result = _RNG.randrange(len(_WHEEL_NUMBERS))
         
-        # Determine color
-        if result == 0:
-            color = "green"
-        elif result in self.RED_NUMBERS:
-            color = "red"
-        else:
-            color = "black"
-            
-        # Determine outcome
-        won = False
-        payout_multiplier = 0
+        # Determine color and outcome from the precomputed tables
+        color = NUMBER_COLOR[result]
         
-        if self.bet_type == "straight":
-            won = int(self.bet_value) == result
-            payout_multiplier = self.BET_TYPES["straight"]["payout"]
-        
-        elif self.bet_type == "red":
-            won = color == "red"
-            payout_multiplier = self.BET_TYPES["red"]["payout"]
-            
-        elif self.bet_type == "black":
-            won = color == "black"
-            payout_multiplier = self.BET_TYPES["black"]["payout"]
-            
-        elif self.bet_type == "even":
-            won = result != 0 and result % 2 == 0
-            payout_multiplier = self.BET_TYPES["even"]["payout"]
-            
-        elif self.bet_type == "odd":
-            won = result != 0 and result % 2 == 1
-            payout_multiplier = self.BET_TYPES["odd"]["payout"]
-            
-        elif self.bet_type == "low":
-            won = 1 <= result <= 18
-            payout_multiplier = self.BET_TYPES["low"]["payout"]
-            
-        elif self.bet_type == "high":
-            won = 19 <= result <= 36
-            payout_multiplier = self.BET_TYPES["high"]["payout"]
-            
-        elif self.bet_type == "dozen":
-            first_dozen = 1 <= result <= 12
-            second_dozen = 13 <= result <= 24
-            third_dozen = 25 <= result <= 36
-            
-            if self.bet_value == "1st" and first_dozen:
-                won = True
-            elif self.bet_value == "2nd" and second_dozen:
-                won = True
-            elif self.bet_value == "3rd" and third_dozen:
-                won = True
-                
-            payout_multiplier = self.BET_TYPES["dozen"]["payout"]
-            
-        elif self.bet_type == "column":
-            first_col = result % 3 == 1 and result != 0
-            second_col = result % 3 == 2 and result != 0
-            third_col = result % 3 == 0 and result != 0
-            
-            if self.bet_value == "1st" and first_col:
-                won = True
-            elif self.bet_value == "2nd" and second_col:
-                won = True
-            elif self.bet_value == "3rd" and third_col:
-                won = True
-                
-            payout_multiplier = self.BET_TYPES["column"]["payout"]
+        resolver = _BET_RESOLVERS[self.bet_kind] if self.bet_kind is not None else None
+        if resolver:
+            won = resolver(result, self.bet_value)
+            payout_multiplier = _BET_PAYOUTS[self.bet_kind]
+        else:
+            won = False
+            payout_multiplier = 0
         
         # Update history
         self.history.append(result)
-        if len(self.history) > 10:
-            self.history = self.history[-10:]
             
         # Calculate winnings
         winnings = 0
@@ -488,36 +735,37 @@ class RouletteGame:
         
         return self.last_result
 
+# Bet type dropdown options, built once and shared by every roulette view
+_ROULETTE_OPTIONS = (
+    SelectOption(label="Red", value="red", description="Bet on red numbers", emoji="🔴"),
+    SelectOption(label="Black", value="black", description="Bet on black numbers", emoji="⚫"),
+    SelectOption(label="Even", value="even", description="Bet on even numbers", emoji="2️⃣"),
+    SelectOption(label="Odd", value="odd", description="Bet on odd numbers", emoji="1️⃣"),
+    SelectOption(label="Low (1-18)", value="low", description="Bet on numbers 1-18", emoji="⬇️"),
+    SelectOption(label="High (19-36)", value="high", description="Bet on numbers 19-36", emoji="⬆️"),
+    SelectOption(label="First Dozen (1-12)", value="dozen:1st", description="Bet on numbers 1-12", emoji="1️⃣"),
+    SelectOption(label="Second Dozen (13-24)", value="dozen:2nd", description="Bet on numbers 13-24", emoji="2️⃣"),
+    SelectOption(label="Third Dozen (25-36)", value="dozen:3rd", description="Bet on numbers 25-36", emoji="3️⃣"),
+    SelectOption(label="Straight (Single Number)", value="straight", description="Bet on a single number", emoji="🎯")
+)
+
 class RouletteView(View):
     """Interactive view for roulette game"""
     
-    def __init__(self, player_id: str, economy, bet: int = 10):
+    def __init__(self, player_id: Union[int, str], economy, bet: int = 10):
         super().__init__(timeout=300)  # 5 minutes timeout
-        self.player_id = player_id
+        self.player_id = int(player_id)  # Compared directly against interaction.user.id
         self.economy = economy
-        self.game = RouletteGame(player_id)
+        self.game = RouletteGame(self.player_id)
         self.bet = bet
         self.message = None
         self.add_bet_type_select()
         
     def add_bet_type_select(self):
         """Add the bet type selection dropdown"""
-        options = [
-            SelectOption(label="Red", value="red", description="Bet on red numbers", emoji="🔴"),
-            SelectOption(label="Black", value="black", description="Bet on black numbers", emoji="⚫"),
-            SelectOption(label="Even", value="even", description="Bet on even numbers", emoji="2️⃣"),
-            SelectOption(label="Odd", value="odd", description="Bet on odd numbers", emoji="1️⃣"),
-            SelectOption(label="Low (1-18)", value="low", description="Bet on numbers 1-18", emoji="⬇️"),
-            SelectOption(label="High (19-36)", value="high", description="Bet on numbers 19-36", emoji="⬆️"),
-            SelectOption(label="First Dozen (1-12)", value="dozen:1st", description="Bet on numbers 1-12", emoji="1️⃣"),
-            SelectOption(label="Second Dozen (13-24)", value="dozen:2nd", description="Bet on numbers 13-24", emoji="2️⃣"),
-            SelectOption(label="Third Dozen (25-36)", value="dozen:3rd", description="Bet on numbers 25-36", emoji="3️⃣"),
-            SelectOption(label="Straight (Single Number)", value="straight", description="Bet on a single number", emoji="🎯")
-        ]
-        
         bet_select = Select(
             placeholder="Select bet type",
-            options=options,
+            options=list(_ROULETTE_OPTIONS),  # Copy so views never share the options list
             custom_id="bet_type"
         )
         
@@ -543,7 +791,7 @@ class RouletteView(View):
     async def bet_type_selected(self, interaction: discord.Interaction):
         """Handle bet type selection"""
         # Check if it's the player's game
-        if str(interaction.user.id) != self.player_id:
+        if interaction.user.id != self.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
             
@@ -580,7 +828,7 @@ class RouletteView(View):
     async def spin_wheel(self, interaction: discord.Interaction):
         """Handle spin button click"""
         # Check if it's the player's game
-        if str(interaction.user.id) != self.player_id:
+        if interaction.user.id != self.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
             
@@ -602,18 +850,20 @@ class RouletteView(View):
         # Create embed with results
         embed = create_roulette_embed(self.game, spin_result=True)
         
-        # Update player economy
+        # Update player economy (credit and stats are independent writes)
         if result["won"]:
-            await self.economy.add_currency(
-                result["winnings"],
-                "roulette_win",
-                {"game": "roulette", "bet_type": self.game.bet_type}
+            await asyncio.gather(
+                self.economy.add_currency(
+                    result["winnings"],
+                    "roulette_win",
+                    {"game": "roulette", "bet_type": self.game.bet_type}
+                ),
+                self.economy.update_gambling_stats("roulette", True, result["winnings"])
             )
-            await self.economy.update_gambling_stats("roulette", True, result["winnings"])
         else:
             await self.economy.update_gambling_stats("roulette", False, self.game.bet_amount)
             
-        # Get new balance
+        # Get new balance once the winnings have been written
         new_balance = await self.economy.get_balance()
         embed.add_field(name="New Balance", value=f"{new_balance} credits", inline=False)
         
@@ -628,7 +878,7 @@ class RouletteView(View):
     async def play_again(self, interaction: discord.Interaction):
         """Handle play again button click"""
         # Check if it's the player's game
-        if str(interaction.user.id) != self.player_id:
+        if interaction.user.id != self.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
             
@@ -698,6 +948,13 @@ class RouletteNumberModal(discord.ui.Modal):
                 ephemeral=True
             )
 
+# Embed color factory and marker emoji for each roulette number color
+_ROULETTE_COLOR_DISPLAY = {
+    "red": (discord.Color.red, "🔴"),
+    "black": (discord.Color.dark_gray, "⚫"),
+    "green": (discord.Color.green, "🟢")
+}
+
 def create_roulette_embed(game: RouletteGame, bet_placed: bool = False, spin_result: bool = False) -> discord.Embed:
     """Create an embed for roulette game
     
@@ -712,17 +969,15 @@ def create_roulette_embed(game: RouletteGame, bet_placed: bool = False, spin_res
     if spin_result and game.last_result:
         # Show spin results
         result = game.last_result
+        color = result["color"]
+        number = result["number"]
+        bet_type = result["bet_type"]
+        bet_value = result["bet_value"]
         
         # Determine color based on result
-        if result["color"] == "red":
-            embed_color = discord.Color.red()
-            number_display = f"🔴 {result['number']}"
-        elif result["color"] == "black":
-            embed_color = discord.Color.dark_gray()
-            number_display = f"⚫ {result['number']}"
-        else:  # Green for 0
-            embed_color = discord.Color.green()
-            number_display = f"🟢 {result['number']}"
+        color_factory, color_emoji = _ROULETTE_COLOR_DISPLAY.get(color, _ROULETTE_COLOR_DISPLAY["green"])
+        embed_color = color_factory()
+        number_display = f"{color_emoji} {number}"
             
         embed = discord.Embed(
             title="🎲 Roulette Results 🎲",
@@ -731,12 +986,12 @@ def create_roulette_embed(game: RouletteGame, bet_placed: bool = False, spin_res
         )
         
         # Bet details
-        bet_display = f"{result['bet_type'].title()}"
-        if result['bet_value'] is not None:
-            if result['bet_type'] == 'straight':
-                bet_display += f" ({result['bet_value']})"
+        bet_display = f"{bet_type.title()}"
+        if bet_value is not None:
+            if bet_type == 'straight':
+                bet_display += f" ({bet_value})"
             else:
-                bet_display += f" ({result['bet_value']})"
+                bet_display += f" ({bet_value})"
                 
         embed.add_field(
             name="Your Bet",
@@ -829,55 +1084,66 @@ class SlotMachine:
             ("7️⃣", "7️⃣", "7️⃣"): 20,  # Triple 7s (higher payout)
             ("🎰", "🎰", "🎰"): 50   # Triple slots (jackpot)
         }
+        # Cumulative weights for bisect-based weighted draws
+        self._cum_weights = list(itertools.accumulate(self.weights))
+        self._total_weight = self._cum_weights[-1]
+        # Reels are drawn as symbol indices; payouts are looked up by index
+        sym_id = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._pay = tuple(self.payouts[symbol] for symbol in self.symbols)
+        self._special = {
+            tuple(sym_id[symbol] for symbol in combo): multiplier
+            for combo, multiplier in self.special_combos.items()
+        }
     
     def spin(self) -> Tuple[List[str], int, int]:
         """Spin the slot machine and return results"""
         # Select symbols based on weights
-        results = random.choices(self.symbols, weights=self.weights, k=3)
+        symbols = self.symbols
+        cum_weights = self._cum_weights
+        total = self._total_weight
+        draw = _RNG.random
+        ids = tuple(bisect.bisect(cum_weights, draw() * total) for _ in range(3))
+        
+        # Most frequent symbol and how many reels show it
+        sym, count = Counter(ids).most_common(1)[0]
         
         # Check for special combinations
-        tuple_result = tuple(results)
-        if tuple_result in self.special_combos:
-            multiplier = self.special_combos[tuple_result]
+        if ids in self._special:
+            multiplier = self._special[ids]
         # Check if all symbols are the same
-        elif results[0] == results[1] == results[2]:
-            multiplier = self.payouts[results[0]]
+        elif count == 3:
+            multiplier = self._pay[sym]
         # Check if two symbols are the same
-        elif results[0] == results[1] or results[0] == results[2] or results[1] == results[2]:
-            # Find the duplicated symbol
-            if results[0] == results[1]:
-                symbol = results[0]
-            elif results[0] == results[2]:
-                symbol = results[0]
-            else:
-                symbol = results[1]
-            multiplier = self.payouts[symbol] // 2  # Half payout for two matching
+        elif count == 2:
+            multiplier = self._pay[sym] // 2  # Half payout for two matching
         else:
             multiplier = 0
         
-        return results, multiplier
+        return [symbols[i] for i in ids], multiplier
 
 class SlotsView(View):
-    def __init__(self, player_id: str, economy, bet: int = 10):
+    def __init__(self, player_id: Union[int, str], economy, bet: int = 10):
         super().__init__(timeout=300)  # 5 minutes timeout
-        self.player_id = player_id
+        self.player_id = int(player_id)  # Compared directly against interaction.user.id
         self.economy = economy
         self.slot_machine = SlotMachine()
         self.bet = bet
         self.message = None
+    
+    @staticmethod
+    def _balance_embed(description: str, color: discord.Color, balance: int) -> discord.Embed:
+        """Build the status embed shared by the timeout, change bet and quit handlers"""
+        embed = discord.Embed(title="🎰 Slot Machine 🎰", description=description, color=color)
+        embed.add_field(name="Your Balance", value=f"{balance} credits", inline=False)
+        return embed
         
     async def on_timeout(self):
         """Handle view timeout by disabling buttons"""
         self.disable_all_buttons()
         if self.message:
             try:
-                embed = discord.Embed(
-                    title="🎰 Slot Machine 🎰",
-                    description="Game timed out due to inactivity.",
-                    color=discord.Color.dark_gray()
-                )
                 balance = await self.economy.get_balance()
-                embed.add_field(name="Your Balance", value=f"{balance} credits", inline=False)
+                embed = self._balance_embed("Game timed out due to inactivity.", discord.Color.dark_gray(), balance)
                 await self.message.edit(embed=embed, view=None)
             except Exception as e:
                 logger.error(f"Error handling slots timeout: {e}")
@@ -885,7 +1151,7 @@ class SlotsView(View):
     @discord.ui.button(label="Spin", style=ButtonStyle.primary)
     async def spin_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if it's the player's game
-        if str(interaction.user.id) != self.player_id:
+        if interaction.user.id != self.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
         
@@ -922,26 +1188,28 @@ class SlotsView(View):
         # Add the spin animation effect with a loading message
         await interaction.response.defer()
         
-        # Simulate spinning animation
+        # Simulate spinning animation: the loading message carries the first
+        # frame, so only one intermediate edit is needed before the result.
+        # Both frames come from a single draw.
+        frames = _RNG.choices(self.slot_machine.symbols, k=6)
         loading_embed = discord.Embed(
             title="🎰 Slot Machine 🎰",
             description="Spinning...",
             color=discord.Color.blue()
         )
         loading_embed.add_field(name="Bet", value=f"{self.bet} credits", inline=False)
+        loading_embed.add_field(name="Reels", value=" | ".join(frames[:3]), inline=False)
         loading_message = await interaction.followup.send(embed=loading_embed)
+        await asyncio.sleep(0.7)
         
-        # Simulate spinning with random symbols
-        for _ in range(3):
-            temp_symbols = random.choices(self.slot_machine.symbols, k=3)
-            temp_embed = discord.Embed(
-                title="🎰 Slot Machine 🎰",
-                description="Spinning...",
-                color=discord.Color.blue()
-            )
-            temp_embed.add_field(name="Reels", value=" | ".join(temp_symbols), inline=False)
-            await loading_message.edit(embed=temp_embed)
-            await asyncio.sleep(0.7)
+        temp_embed = discord.Embed(
+            title="🎰 Slot Machine 🎰",
+            description="Spinning...",
+            color=discord.Color.blue()
+        )
+        temp_embed.add_field(name="Reels", value=" | ".join(frames[3:]), inline=False)
+        await loading_message.edit(embed=temp_embed)
+        await asyncio.sleep(0.7)
         
         # Show final result
         embed.add_field(name="Reels", value=" | ".join(symbols), inline=False)
@@ -951,8 +1219,8 @@ class SlotsView(View):
         else:
             embed.add_field(name="Result", value=f"Better luck next time!", inline=False)
         
-        # Add new balance
-        new_balance = await self.economy.get_balance()
+        # Add new balance, derived from the balance read before the bet
+        new_balance = balance - self.bet + winnings
         embed.add_field(name="Your Balance", value=f"{new_balance} credits", inline=False)
         
         # Update the message
@@ -961,7 +1229,7 @@ class SlotsView(View):
     @discord.ui.button(label="Change Bet", style=ButtonStyle.secondary)
     async def change_bet_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if it's the player's game
-        if str(interaction.user.id) != self.player_id:
+        if interaction.user.id != self.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
         
@@ -979,15 +1247,10 @@ class SlotsView(View):
                     await interaction.followup.send("Bet must be greater than 0!", ephemeral=True)
                 else:
                     self.bet = new_bet
-                    embed = discord.Embed(
-                        title="🎰 Slot Machine 🎰",
-                        description=f"Bet changed to {self.bet} credits",
-                        color=discord.Color.blue()
-                    )
                     
-                    # Add current balance
+                    # Show current balance
                     balance = await self.economy.get_balance()
-                    embed.add_field(name="Your Balance", value=f"{balance} credits", inline=False)
+                    embed = self._balance_embed(f"Bet changed to {self.bet} credits", discord.Color.blue(), balance)
                     
                     await interaction.followup.send(embed=embed, ephemeral=True)
             except ValueError:
@@ -996,21 +1259,15 @@ class SlotsView(View):
     @discord.ui.button(label="Quit", style=ButtonStyle.danger)
     async def quit_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if it's the player's game
-        if str(interaction.user.id) != self.player_id:
+        if interaction.user.id != self.player_id:
             await interaction.response.send_message("This isn't your game!", ephemeral=True)
             return
         
         self.disable_all_buttons()
         
-        embed = discord.Embed(
-            title="🎰 Slot Machine 🎰",
-            description="Thanks for playing!",
-            color=discord.Color.dark_gray()
-        )
-        
-        # Add current balance
+        # Show current balance
         balance = await self.economy.get_balance()
-        embed.add_field(name="Your Balance", value=f"{balance} credits", inline=False)
+        embed = self._balance_embed("Thanks for playing!", discord.Color.dark_gray(), balance)
         
         await interaction.response.edit_message(embed=embed, view=None)
     
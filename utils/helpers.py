@@ -3,13 +3,59 @@ Helper utilities for the Discord bot
 """
 import logging
 import os
+import re
 import asyncio
-from typing import Any, Dict, List, Optional, Union, Callable
+import itertools
+import time
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, Callable
 import discord
 from discord.ext import commands
 
 logger = logging.getLogger(__name__)
 
+def _cache_put(cache: Dict[Any, tuple], key: Any, value: Any, ttl: float, max_entries: int) -> None:
+    """Store a (checked_at, value) entry in a TTL cache, keeping it bounded
+    
+    Once the cache holds more than max_entries, expired entries are dropped,
+    then the oldest entries if it is still over three quarters full.
+    
+    Args:
+        cache: Cache dict, ordered oldest entry first
+        key: Cache key
+        value: Value to cache
+        ttl: Seconds an entry stays valid
+        max_entries: Size at which the cache is pruned
+    """
+    now = time.monotonic()
+    # Re-insert so the cache stays ordered oldest first
+    cache.pop(key, None)
+    cache[key] = (now, value)
+    if len(cache) <= max_entries:
+        return
+    
+    for cached_key, (checked_at, _) in list(cache.items()):
+        if now - checked_at >= ttl:
+            del cache[cached_key]
+    keep = max_entries * 3 // 4
+    if len(cache) > keep:
+        for cached_key in list(itertools.islice(cache, len(cache) - keep)):
+            del cache[cached_key]
+
+# Short-lived cache of home guild admin checks: user_id -> (checked_at, is_admin)
+_ADMIN_CACHE_TTL = 5.0
+_ADMIN_CACHE_MAX = 10000
+_admin_cache: Dict[int, tuple] = {}
+
+def invalidate_admin_cache(user_id: int) -> None:
+    """Drop a cached home guild admin result for a user
+    
+    Args:
+        user_id: Discord user ID whose cached result should be dropped
+    """
+    _admin_cache.pop(user_id, None)
+
 def is_home_guild_admin(bot, user_id: int) -> bool:
     """Check if a user is an admin of the home guild
     
@@ -20,6 +66,11 @@ def is_home_guild_admin(bot, user_id: int) -> bool:
     Returns:
         True if the user is an admin of the home guild, False otherwise
     """
+    now = time.monotonic()
+    cached = _admin_cache.get(user_id)
+    if cached and now - cached[0] < _ADMIN_CACHE_TTL:
+        return cached[1]
+    
     # Check if bot has home_guild_id attribute
     if not hasattr(bot, 'home_guild_id') or not bot.home_guild_id:
         # Try to get home_guild_id from environment
@@ -43,10 +94,13 @@ def is_home_guild_admin(bot, user_id: int) -> bool:
     member = home_guild.get_member(user_id)
     if not member:
         # User is not in home guild
-        return False
+        result = False
+    else:
+        # Check if user is an admin
+        result = member.guild_permissions.administrator or member.id == bot.owner_id
     
-    # Check if user is an admin
-    return member.guild_permissions.administrator or member.id == bot.owner_id
+    _cache_put(_admin_cache, user_id, result, _ADMIN_CACHE_TTL, _ADMIN_CACHE_MAX)
+    return result
     
 def has_admin_permission(ctx) -> bool:
     """Check if a user has admin permission in the current guild
@@ -61,16 +115,15 @@ def has_admin_permission(ctx) -> bool:
     if ctx.author.id == ctx.bot.owner_id:
         return True
         
-    # Check if user is home guild admin
-    if is_home_guild_admin(ctx.bot, ctx.author.id):
-        return True
-        
-    # Check if user has admin permission in the current guild
+    # Check if user has admin permission in the current guild (cheapest, most common)
     if ctx.guild and ctx.author.guild_permissions.administrator:
         return True
         
-    return False
+    # Check if user is home guild admin
+    return is_home_guild_admin(ctx.bot, ctx.author.id)
     
+_MOD_ROLE_NAMES = frozenset({'mod', 'moderator'})
+
 def has_mod_permission(ctx) -> bool:
     """Check if a user has moderator permission in the current guild
     
@@ -95,33 +148,46 @@ def has_mod_permission(ctx) -> bool:
         try:
             # This part would normally query the database for mod roles
             # For now, just check for basic mod role names
-            mod_role_names = ['mod', 'moderator']
-            for role in ctx.author.roles:
-                if role.name.lower() in mod_role_names:
-                    return True
+            if any(role.name.lower() in _MOD_ROLE_NAMES for role in ctx.author.roles):
+                return True
         except Exception as e:
             logger.error(f"Error checking mod roles: {e}")
         
     return False
     
+# Short-lived cache of guild premium tiers: guild_id -> (checked_at, tier)
+_PREMIUM_TIER_CACHE_TTL = 10.0
+_PREMIUM_TIER_CACHE_MAX = 10000
+_premium_tier_cache: Dict[str, tuple] = {}
+
 async def get_guild_premium_tier(db, guild_id: str) -> int:
     """Get premium tier for a guild
     
+    Guild documents store guild_id as a string and are looked up through the
+    unique guilds.guild_id index created by utils.server_utils.create_indexes
+    (called from bot.initialize_bot).
+    
     Args:
         db: Database connection
-        guild_id: Discord guild ID
+        guild_id: Discord guild ID (string preferred; ints are converted)
         
     Returns:
         Premium tier (0-3)
     """
-    # Get guild from database
+    if not isinstance(guild_id, str):
+        guild_id = str(guild_id)
+    now = time.monotonic()
+    cached = _premium_tier_cache.get(guild_id)
+    if cached and now - cached[0] < _PREMIUM_TIER_CACHE_TTL:
+        return cached[1]
+    
+    # Get guild's premium tier from database
     guild_coll = db["guilds"]
-    guild_doc = await guild_coll.find_one({"guild_id": str(guild_id)})
+    guild_doc = await guild_coll.find_one({"guild_id": guild_id}, {"premium_tier": 1, "_id": 0})
     
-    if not guild_doc:
-        return 0
-        
-    return guild_doc.get("premium_tier", 0)
+    tier = guild_doc.get("premium_tier", 0) if guild_doc else 0
+    _cache_put(_premium_tier_cache, guild_id, tier, _PREMIUM_TIER_CACHE_TTL, _PREMIUM_TIER_CACHE_MAX)
+    return tier
     
 async def update_voice_channel_name(bot, channel_id: int, name: str) -> bool:
     """Update voice channel name
@@ -162,6 +228,18 @@ def format_datetime(dt) -> str:
         
     return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
     
+# (upper bound in seconds, divisor, unit) buckets for format_time_ago
+_TIME_AGO_BUCKETS = (
+    (60, 1, "second"),
+    (3600, 60, "minute"),
+    (86400, 3600, "hour"),
+    (604800, 86400, "day"),  # 7 days
+    (2592000, 604800, "week"),  # 30 days
+    (31536000, 2592000, "month"),  # 365 days
+    (float("inf"), 31536000, "year"),
+)
+_TIME_AGO_THRESHOLDS = tuple(bucket[0] for bucket in _TIME_AGO_BUCKETS)
+
 def format_time_ago(dt) -> str:
     """Format a datetime object into a human-readable 'time ago' string
     
@@ -177,28 +255,12 @@ def format_time_ago(dt) -> str:
     now = datetime.utcnow()
     diff = now - dt
     
-    seconds = diff.total_seconds()
+    # Clock skew can put fresh timestamps slightly in the future
+    seconds = max(diff.total_seconds(), 0)
     
-    if seconds < 60:
-        return f"{int(seconds)} seconds ago"
-    elif seconds < 3600:
-        minutes = int(seconds // 60)
-        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-    elif seconds < 86400:
-        hours = int(seconds // 3600)
-        return f"{hours} hour{'s' if hours != 1 else ''} ago"
-    elif seconds < 604800:  # 7 days
-        days = int(seconds // 86400)
-        return f"{days} day{'s' if days != 1 else ''} ago"
-    elif seconds < 2592000:  # 30 days
-        weeks = int(seconds // 604800)
-        return f"{weeks} week{'s' if weeks != 1 else ''} ago"
-    elif seconds < 31536000:  # 365 days
-        months = int(seconds // 2592000)
-        return f"{months} month{'s' if months != 1 else ''} ago"
-    else:
-        years = int(seconds // 31536000)
-        return f"{years} year{'s' if years != 1 else ''} ago"
+    _, divisor, unit = _TIME_AGO_BUCKETS[bisect_right(_TIME_AGO_THRESHOLDS, seconds)]
+    count = int(seconds // divisor)
+    return f"{count} {unit}{'s' if count != 1 else ''} ago"
 
 def format_duration(seconds: int) -> str:
     """Format a duration in seconds into a human-readable string
@@ -211,18 +273,26 @@ def format_duration(seconds: int) -> str:
     """
     if seconds < 60:
         return f"{seconds}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        sec = seconds % 60
-        return f"{minutes}m {sec}s"
-    elif seconds < 86400:
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        return f"{hours}h {minutes}m"
-    else:
-        days = seconds // 86400
-        hours = (seconds % 86400) // 3600
+    
+    days, rem = divmod(seconds, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, sec = divmod(rem, 60)
+    if days:
         return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m {sec}s"
+
+def format_currency_int(amount: int) -> str:
+    """Format an integer currency amount
+    
+    Args:
+        amount: Currency amount
+        
+    Returns:
+        Formatted currency string
+    """
+    return f"{amount:,d}"
 
 def format_currency(amount: Union[int, float]) -> str:
     """Format a currency amount
@@ -233,6 +303,8 @@ def format_currency(amount: Union[int, float]) -> str:
     Returns:
         Formatted currency string
     """
+    if isinstance(amount, int):
+        return format_currency_int(amount)
     return f"{amount:,}"
 
 def calculate_kd_ratio(kills: int, deaths: int) -> float:
@@ -245,9 +317,19 @@ def calculate_kd_ratio(kills: int, deaths: int) -> float:
     Returns:
         K/D ratio (kills / deaths, with deaths=1 if deaths=0)
     """
-    if deaths == 0:
-        deaths = 1
-    return kills / deaths
+    return kills / (deaths or 1)
+
+# Premium tier requirements for different features
+_FEATURE_REQUIREMENTS = {
+    'bounties': 2,
+    'rivalries': 1,
+    'factions': 2,
+    'events': 1,
+    'leaderboards': 0,
+    'history': 0,
+    'stats': 0,
+    'kill_feed': 0,
+}
 
 def is_feature_enabled(guild_doc: Dict[str, Any], feature_name: str) -> bool:
     """Check if a feature is enabled for a guild
@@ -259,20 +341,8 @@ def is_feature_enabled(guild_doc: Dict[str, Any], feature_name: str) -> bool:
     Returns:
         True if the feature is enabled, False otherwise
     """
-    # Premium tier requirements for different features
-    feature_requirements = {
-        'bounties': 2,
-        'rivalries': 1,
-        'factions': 2,
-        'events': 1,
-        'leaderboards': 0,
-        'history': 0,
-        'stats': 0,
-        'kill_feed': 0,
-    }
-    
     # Get required tier for the feature
-    required_tier = feature_requirements.get(feature_name, 3)
+    required_tier = _FEATURE_REQUIREMENTS.get(feature_name, 3)
     
     # Get guild premium tier (default to 0)
     guild_tier = guild_doc.get('premium_tier', 0)
@@ -280,6 +350,23 @@ def is_feature_enabled(guild_doc: Dict[str, Any], feature_name: str) -> bool:
     # Check if the guild meets the required tier
     return guild_tier >= required_tier
 
+class _PaginationView(discord.ui.View):
+    """Simple previous/next paginator used by paginate_embeds"""
+    def __init__(self, embeds: List[discord.Embed], timeout: int):
+        super().__init__(timeout=timeout)
+        self.current_page = 0
+        self.embeds = embeds
+    
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_button(self, button, interaction):
+        self.current_page = max(0, self.current_page - 1)
+        await interaction.response.edit_message(embed=self.embeds[self.current_page])
+    
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.primary)
+    async def next_button(self, button, interaction):
+        self.current_page = min(len(self.embeds) - 1, self.current_page + 1)
+        await interaction.response.edit_message(embed=self.embeds[self.current_page])
+
 async def paginate_embeds(ctx, embeds: List[discord.Embed], timeout: int = 180):
     """Create a paginated view of embeds
     
@@ -296,41 +383,37 @@ async def paginate_embeds(ctx, embeds: List[discord.Embed], timeout: int = 180):
         await ctx.send(embed=embeds[0])
         return
     
-    # Create a simple custom paginator view
-    class PaginationView(discord.ui.View):
-        def __init__(self):
-            super().__init__(timeout=timeout)
-            self.current_page = 0
-            self.embeds = embeds
-        
-        @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
-        async def previous_button(self, button, interaction):
-            self.current_page = max(0, self.current_page - 1)
-            await interaction.response.edit_message(embed=self.embeds[self.current_page])
-        
-        @discord.ui.button(label="Next", style=discord.ButtonStyle.primary)
-        async def next_button(self, button, interaction):
-            self.current_page = min(len(self.embeds) - 1, self.current_page + 1)
-            await interaction.response.edit_message(embed=self.embeds[self.current_page])
-    
     # Send the first embed with pagination view
-    view = PaginationView()
+    view = _PaginationView(embeds, timeout)
     if hasattr(ctx, 'interaction') and ctx.interaction:
         await ctx.interaction.response.send_message(embed=embeds[0], view=view)
     else:
         await ctx.send(embed=embeds[0], view=view)
 
-def chunk_list(lst: List[Any], chunk_size: int) -> List[List[Any]]:
-    """Split a list into chunks of specified size
+def chunk_list(lst: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """Split an iterable into chunks of specified size
+    
+    Chunks are produced lazily; wrap in list() if all of them are needed at once.
     
     Args:
-        lst: List to split
+        lst: Iterable to split
         chunk_size: Size of each chunk
         
-    Returns:
-        List of chunks
+    Yields:
+        Lists of up to chunk_size items
     """
-    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+    it = iter(lst)
+    while chunk := list(itertools.islice(it, chunk_size)):
+        yield chunk
+
+# Special death causes, in priority order; the lookahead alternation keeps
+# "suicide" winning over "fall" etc. regardless of where each appears
+_WEAPON_KINDS = ("Suicide", "Vehicle", "Fall Damage", "Relocation")
+_WEAPON_KIND_RE = re.compile(
+    r'(?=.*(suicide|killed_self))|(?=.*(vehicle))|(?=.*(fall))|(?=.*(relocation))',
+    re.DOTALL,
+)
+_WEAPON_PREFIX_RE = re.compile(r'^(?:weapon_)?(?:item_)?(?:gadget_)?')
 
 def normalize_weapon_name(weapon: str) -> str:
     """Normalize weapon name to consistent format
@@ -348,23 +431,20 @@ def normalize_weapon_name(weapon: str) -> str:
     weapon = weapon.lower().strip()
     
     # Handle common variations
-    if 'suicide' in weapon or 'killed_self' in weapon:
-        return "Suicide"
-    elif 'vehicle' in weapon:
-        return "Vehicle"
-    elif 'fall' in weapon:
-        return "Fall Damage"
-    elif 'relocation' in weapon:
-        return "Relocation"
-    
-    # Remove unnecessary prefixes
-    prefixes = ['weapon_', 'item_', 'gadget_']
-    for prefix in prefixes:
-        if weapon.startswith(prefix):
-            weapon = weapon[len(prefix):]
-    
-    # Capitalize for display
-    return weapon.title()
+    match = _WEAPON_KIND_RE.match(weapon)
+    if match:
+        return _WEAPON_KINDS[match.lastindex - 1]
+    
+    # Remove unnecessary prefixes and capitalize for display
+    return _WEAPON_PREFIX_RE.sub('', weapon, count=1).title()
+
+class _ThrottleState:
+    """Call count and window reset time for one throttle key"""
+    __slots__ = ("calls", "reset_at")
+    
+    def __init__(self, reset_at: float):
+        self.calls = 0
+        self.reset_at = reset_at
 
 async def throttle(coro, max_calls: int, interval: float, key: Optional[Callable] = None):
     """Throttle a coroutine to limit execution rate
@@ -386,31 +466,50 @@ async def throttle(coro, max_calls: int, interval: float, key: Optional[Callable
     if not hasattr(throttle, "_state"):
         throttle._state = {}
     
+    loop = asyncio.get_event_loop()
+    
     # Get or create throttling state for this key
     key_value = key()
     if key_value not in throttle._state:
-        throttle._state[key_value] = {"calls": 0, "reset_at": asyncio.get_event_loop().time() + interval}
+        throttle._state[key_value] = _ThrottleState(loop.time() + interval)
     
     state = throttle._state[key_value]
     
-    # Check if we need to reset the counter
-    now = asyncio.get_event_loop().time()
-    if now >= state["reset_at"]:
-        state["calls"] = 0
-        state["reset_at"] = now + interval
-    
-    # Check if we're at the limit
-    if state["calls"] >= max_calls:
-        wait_time = state["reset_at"] - now
+    while True:
+        # Check if we need to reset the counter
+        now = loop.time()
+        if now >= state.reset_at:
+            state.calls = 0
+            state.reset_at = now + interval
+        
+        # Check if we're under the limit
+        if state.calls < max_calls:
+            break
+        
+        wait_time = state.reset_at - now
         logger.debug(f"Throttling {coro.__name__}: waiting {wait_time:.2f}s")
         await asyncio.sleep(wait_time)
-        # Recursively call ourselves after waiting
-        return await throttle(coro, max_calls, interval, key)
     
     # Increment counter and run the coroutine
-    state["calls"] += 1
+    state.calls += 1
     return await coro
     
+class _ConfirmView(discord.ui.View):
+    """Yes/No view used by confirm"""
+    def __init__(self, timeout: int):
+        super().__init__(timeout=timeout)
+        self.value = None
+        
+    @discord.ui.button(label="Yes", style=discord.ButtonStyle.green)
+    async def yes_button(self, button, interaction):
+        self.value = True
+        self.stop()
+        
+    @discord.ui.button(label="No", style=discord.ButtonStyle.red)
+    async def no_button(self, button, interaction):
+        self.value = False
+        self.stop()
+
 async def confirm(ctx, message: str = "Are you sure?", timeout: int = 60, delete_after: bool = True) -> bool:
     """Ask for confirmation before proceeding with an action
     
@@ -423,22 +522,7 @@ async def confirm(ctx, message: str = "Are you sure?", timeout: int = 60, delete
     Returns:
         True if confirmed, False otherwise
     """
-    class ConfirmView(discord.ui.View):
-        def __init__(self):
-            super().__init__(timeout=timeout)
-            self.value = None
-            
-        @discord.ui.button(label="Yes", style=discord.ButtonStyle.green)
-        async def yes_button(self, button, interaction):
-            self.value = True
-            self.stop()
-            
-        @discord.ui.button(label="No", style=discord.ButtonStyle.red)
-        async def no_button(self, button, interaction):
-            self.value = False
-            self.stop()
-            
-    view = ConfirmView()
+    view = _ConfirmView(timeout)
     
     # Send the confirmation message
     msg = await ctx.send(message, view=view)
@@ -9,9 +9,12 @@ This module provides:
 2. Helper functions for normalizing data between parsers
 3. Utilities for ensuring parser coordination and avoiding duplicates
 """
+import hashlib
 import logging
 import os
-from datetime import datetime, timedelta
+import re
+from array import array
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Union, Set, Tuple
 
 from utils.csv_parser import CSVParser
@@ -19,69 +22,203 @@ from utils.log_parser import LogParser, parse_log_file
 
 logger = logging.getLogger(__name__)
 
+# Deadside timestamps ("2024.01.02-10.11.12[:123]") and space-separated ISO-like
+# variants; matched directly so the common cases never reach strptime
+_TIMESTAMP_RE = re.compile(
+    r'(\d{4})[.\-](\d{2})[.\-](\d{2})[ \-.T](\d{2})[.:](\d{2})[.:](\d{2})(?:[.:](\d{1,6}))?'
+)
+_TIMESTAMP_FORMATS = (
+    "%Y.%m.%d-%H.%M.%S",
+    "%Y.%m.%d-%H.%M.%S:%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+)
+
+CONNECTION_EVENT_TYPES = frozenset({"register", "unregister", "join", "kick"})
+GAME_EVENT_TYPES = frozenset({"airdrop", "helicrash", "trader", "convoy"})
+
+def _mission_hash(event: Dict[str, Any], timestamp: str) -> str:
+    return f"{timestamp}_{event.get('mission_name', '')}_{event.get('location', '')}"
+
+def _game_event_hash(event: Dict[str, Any], timestamp: str) -> str:
+    return f"{timestamp}_{event.get('event_type', '')}_{event.get('event_id', '')}"
+
+def _connection_hash(event: Dict[str, Any], timestamp: str) -> str:
+    return f"{timestamp}_{event.get('event_type', '')}_{event.get('player_id', '')}"
+
+# event_type -> category for events with an explicit type
+_EVENT_TYPE_CATEGORIES = {
+    "mission": "mission",
+    **{event_type: "game_event" for event_type in GAME_EVENT_TYPES},
+    **{event_type: "connection" for event_type in CONNECTION_EVENT_TYPES},
+}
+
+# event_type -> hash string builder for non-kill events
+_EVENT_HASH_BUILDERS = {
+    "mission": _mission_hash,
+    **{event_type: _game_event_hash for event_type in GAME_EVENT_TYPES},
+    **{event_type: _connection_hash for event_type in CONNECTION_EVENT_TYPES},
+}
+
+class RecentHashTable:
+    """Exact set of the most recent 64-bit hashes with fixed memory
+    
+    An open-addressing table (linear probing) holds the hashes and a ring
+    buffer remembers insertion order; once the ring is full, each new hash
+    evicts the oldest one. Lookups never report a hash that was not added,
+    so an old duplicate may be missed but a new event is never dropped.
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        """Initialize the table
+        
+        Args:
+            capacity: Number of most recent hashes to remember
+            
+        Raises:
+            ValueError: If capacity is less than 1
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        # Keep at least one slot empty so probe loops always terminate
+        size = 1
+        while size <= capacity or size < capacity * 3 // 2:
+            size <<= 1
+        self._mask = size - 1
+        self._slots = array('Q', bytes(8 * size))  # 0 marks an empty slot
+        self._ring = array('Q', bytes(8 * capacity))
+        self._pos = 0
+    
+    def _find(self, key: int) -> int:
+        """Return the slot holding key, or the empty slot where it would go"""
+        slots = self._slots
+        mask = self._mask
+        i = key & mask
+        while slots[i] and slots[i] != key:
+            i = (i + 1) & mask
+        return i
+    
+    def _remove(self, key: int):
+        """Remove a key, shifting later probe-chain entries back into the gap"""
+        slots = self._slots
+        mask = self._mask
+        i = self._find(key)
+        if not slots[i]:
+            return
+        j = i
+        while True:
+            j = (j + 1) & mask
+            other = slots[j]
+            if not other:
+                break
+            home = other & mask
+            # Leave entries whose home slot lies cyclically in (i, j]
+            if (i < j and i < home <= j) or (i > j and (home > i or home <= j)):
+                continue
+            slots[i] = other
+            i = j
+        slots[i] = 0
+    
+    def __contains__(self, key: int) -> bool:
+        key = key or 1
+        return self._slots[self._find(key)] == key
+    
+    def add(self, key: int):
+        """Insert a key, evicting the oldest one when full"""
+        self.check_and_add(key)
+    
+    def check_and_add(self, key: int) -> bool:
+        """Insert a key unless present, with a single probe on the fast path
+        
+        Returns:
+            bool: True if the key was already present
+        """
+        key = key or 1
+        i = self._find(key)
+        if self._slots[i] == key:
+            return True
+        
+        oldest = self._ring[self._pos]
+        if oldest:
+            self._remove(oldest)
+            i = self._find(key)
+        self._slots[i] = key
+        self._ring[self._pos] = key
+        self._pos = (self._pos + 1) % len(self._ring)
+        return False
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_UNSET_MICROS = -(1 << 63)
+
+def _to_micros(timestamp: datetime) -> int:
+    """Convert a (naive UTC or aware) datetime to epoch microseconds"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _ONE_MICROSECOND
+
 class ParserCoordinator:
     """Coordinates between the three parser subsystems to avoid duplicate events"""
     
     def __init__(self):
         """Initialize parser coordinator"""
-        self.last_processed_csv_timestamps = {}  # server_id -> timestamp
-        self.last_processed_log_timestamps = {}  # server_id -> timestamp
-        self.processed_event_hashes = set()  # Set to track processed event hashes
+        # Last processed timestamps as epoch microseconds, in parallel arrays
+        # indexed by each server's slot in _server_idx
+        self._server_idx = {}  # server_id -> slot
+        self._csv_ts = array('q')
+        self._log_ts = array('q')
         self.recent_event_window = 3600  # 1 hour window for deduplication
+        self.processed_event_hashes = RecentHashTable(10000)  # Most recent event hashes
+    
+    def _slot(self, server_id: str) -> int:
+        """Get or allocate a server's slot in the timestamp arrays"""
+        slot = self._server_idx.get(server_id)
+        if slot is None:
+            slot = self._server_idx[server_id] = len(self._csv_ts)
+            self._csv_ts.append(_UNSET_MICROS)
+            self._log_ts.append(_UNSET_MICROS)
+        return slot
+    
+    def _last_timestamp(self, timestamps: array, server_id: str) -> Optional[datetime]:
+        """Read a server's timestamp back from one of the arrays"""
+        slot = self._server_idx.get(server_id)
+        if slot is None or timestamps[slot] == _UNSET_MICROS:
+            return None
+        return _EPOCH + timedelta(microseconds=timestamps[slot])
         
-    def generate_event_hash(self, event: Dict[str, Any]) -> str:
+    def generate_event_hash(self, event: Dict[str, Any]) -> int:
         """Generate a hash for an event to check for duplicates
         
         Args:
             event: Event dictionary
             
         Returns:
-            str: Hash string
+            int: 64-bit digest of the event's identifying fields
         """
-        # For kill events
-        if "killer_id" in event and "victim_id" in event:
+        # normalize_event_data stores the ISO form alongside the datetime
+        timestamp = event.get("_ts_iso")
+        if timestamp is None:
             timestamp = event.get("timestamp", "")
             if isinstance(timestamp, datetime):
                 timestamp = timestamp.isoformat()
-                
-            # Create a unique string from key event properties
+        
+        # For kill events
+        if "killer_id" in event and "victim_id" in event:
             hash_string = f"{timestamp}_{event.get('killer_id', '')}_{event.get('victim_id', '')}_{event.get('weapon', '')}"
-            return hash_string
-            
-        # For mission events
-        elif "event_type" in event and event.get("event_type") == "mission":
-            timestamp = event.get("timestamp", "")
-            if isinstance(timestamp, datetime):
-                timestamp = timestamp.isoformat()
-                
-            hash_string = f"{timestamp}_{event.get('mission_name', '')}_{event.get('location', '')}"
-            return hash_string
-            
-        # For other game events (airdrop, helicrash, etc.)
-        elif "event_type" in event and event.get("event_type") in ["airdrop", "helicrash", "trader", "convoy"]:
-            timestamp = event.get("timestamp", "")
-            if isinstance(timestamp, datetime):
-                timestamp = timestamp.isoformat()
-                
-            hash_string = f"{timestamp}_{event.get('event_type', '')}_{event.get('event_id', '')}"
-            return hash_string
-            
-        # For connection events
-        elif "event_type" in event and event.get("event_type") in ["register", "unregister", "join", "kick"]:
-            timestamp = event.get("timestamp", "")
-            if isinstance(timestamp, datetime):
-                timestamp = timestamp.isoformat()
-                
-            hash_string = f"{timestamp}_{event.get('event_type', '')}_{event.get('player_id', '')}"
-            return hash_string
-            
-        # Fallback for unknown event types
         else:
-            timestamp = event.get("timestamp", "")
-            if isinstance(timestamp, datetime):
-                timestamp = timestamp.isoformat()
-                
-            return f"{timestamp}_{hash(str(event))}"
+            # For mission, game and connection events
+            builder = _EVENT_HASH_BUILDERS.get(event.get("event_type"))
+            if builder is not None:
+                hash_string = builder(event, timestamp)
+            else:
+                # Fallback for unknown event types: hash the items directly,
+                # and only build a repr when some value is unhashable
+                try:
+                    hash_string = f"{timestamp}_{hash(tuple(sorted(event.items())))}"
+                except TypeError:
+                    hash_string = f"{timestamp}_{hash(repr(sorted(event.items())))}"
+        
+        return int.from_bytes(hashlib.blake2b(hash_string.encode(), digest_size=8).digest(), "little")
     
     def is_duplicate_event(self, event: Dict[str, Any]) -> bool:
         """Check if an event has already been processed
@@ -92,28 +229,9 @@ class ParserCoordinator:
         Returns:
             bool: True if duplicate, False otherwise
         """
-        event_hash = self.generate_event_hash(event)
-        
-        if event_hash in self.processed_event_hashes:
-            return True
-            
-        # Add to processed set
-        self.processed_event_hashes.add(event_hash)
-        
-        # Keep the set from growing too large by periodically pruning old entries
-        self._prune_old_hashes()
-        
-        return False
-    
-    def _prune_old_hashes(self):
-        """Remove old event hashes to prevent memory growth"""
-        # Every 1000 events, check if we should prune
-        if len(self.processed_event_hashes) > 10000:
-            # Keep only the most recent 1000 events
-            # In a real implementation this would be time-based, but
-            # that would require storing timestamps with each hash
-            if len(self.processed_event_hashes) > 1000:
-                self.processed_event_hashes = set(list(self.processed_event_hashes)[-1000:])
+        # One probe both checks and records the hash; eviction of the oldest
+        # hash happens inside the table, so there is no separate prune step
+        return self.processed_event_hashes.check_and_add(self.generate_event_hash(event))
     
     def update_csv_timestamp(self, server_id: str, timestamp: datetime):
         """Update last processed CSV timestamp for a server
@@ -122,7 +240,7 @@ class ParserCoordinator:
             server_id: Server ID
             timestamp: Last processed timestamp
         """
-        self.last_processed_csv_timestamps[server_id] = timestamp
+        self._csv_ts[self._slot(server_id)] = _to_micros(timestamp)
     
     def update_log_timestamp(self, server_id: str, timestamp: datetime):
         """Update last processed log timestamp for a server
@@ -131,7 +249,7 @@ class ParserCoordinator:
             server_id: Server ID
             timestamp: Last processed timestamp
         """
-        self.last_processed_log_timestamps[server_id] = timestamp
+        self._log_ts[self._slot(server_id)] = _to_micros(timestamp)
     
     def get_last_csv_timestamp(self, server_id: str) -> Optional[datetime]:
         """Get last processed CSV timestamp for a server
@@ -142,7 +260,7 @@ class ParserCoordinator:
         Returns:
             datetime or None: Last processed timestamp
         """
-        return self.last_processed_csv_timestamps.get(server_id)
+        return self._last_timestamp(self._csv_ts, server_id)
     
     def get_last_log_timestamp(self, server_id: str) -> Optional[datetime]:
         """Get last processed log timestamp for a server
@@ -153,7 +271,7 @@ class ParserCoordinator:
         Returns:
             datetime or None: Last processed timestamp
         """
-        return self.last_processed_log_timestamps.get(server_id)
+        return self._last_timestamp(self._log_ts, server_id)
     
     def should_process_csv(self, server_id: str, csv_timestamp: datetime) -> bool:
         """Check if a CSV file should be processed
@@ -165,14 +283,11 @@ class ParserCoordinator:
         Returns:
             bool: True if should process, False otherwise
         """
-        last_timestamp = self.get_last_csv_timestamp(server_id)
+        slot = self._server_idx.get(server_id)
         
-        # If we haven't processed any CSV for this server, process it
-        if last_timestamp is None:
-            return True
-            
-        # Process only if it's newer than the last processed timestamp
-        return csv_timestamp > last_timestamp
+        # Process if we haven't processed any CSV for this server, or if it's
+        # newer than the last processed timestamp (unset slots hold the minimum)
+        return slot is None or _to_micros(csv_timestamp) > self._csv_ts[slot]
     
     def should_process_log(self, server_id: str, log_timestamp: datetime) -> bool:
         """Check if a log entry should be processed
@@ -184,83 +299,104 @@ class ParserCoordinator:
         Returns:
             bool: True if should process, False otherwise
         """
-        last_timestamp = self.get_last_log_timestamp(server_id)
+        slot = self._server_idx.get(server_id)
         
-        # If we haven't processed any logs for this server, process it
-        if last_timestamp is None:
-            return True
-            
-        # Process only if it's newer than the last processed timestamp
-        return log_timestamp > last_timestamp
+        # Process if we haven't processed any logs for this server, or if it's
+        # newer than the last processed timestamp (unset slots hold the minimum)
+        return slot is None or _to_micros(log_timestamp) > self._log_ts[slot]
 
 # Create a global coordinator instance
 parser_coordinator = ParserCoordinator()
 
-def normalize_event_data(event: Dict[str, Any]) -> Dict[str, Any]:
-    """Normalize event data from different parser sources
-    
-    Ensures consistent field names and data types across all parser outputs.
+# Fields whose None values become "" / 0 during normalization
+_STRING_FIELDS = ("killer_id", "victim_id", "player_id",
+                  "killer_name", "victim_name", "player_name", "weapon", "location")
+_NUMERIC_FIELDS = ("distance",)
+
+def _parse_timestamp(timestamp: str) -> Optional[datetime]:
+    """Parse a timestamp string from any of the supported log formats
     
     Args:
-        event: Raw event dictionary
+        timestamp: Timestamp string
         
     Returns:
-        Dict: Normalized event dictionary
+        datetime or None: Parsed timestamp, or None if no format matched
     """
-    normalized = event.copy()
+    # Deadside's own "YYYY.MM.DD-HH.MM.SS" layout is the most common; rewrite
+    # it to ISO and let fromisoformat do the parsing
+    if len(timestamp) == 19 and timestamp[4] == "." and timestamp[10] == "-":
+        try:
+            return datetime.fromisoformat(
+                f"{timestamp[:4]}-{timestamp[5:7]}-{timestamp[8:10]}"
+                f"T{timestamp[11:13]}:{timestamp[14:16]}:{timestamp[17:19]}"
+            )
+        except ValueError:
+            pass
     
+    try:
+        # Then plain ISO format
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        pass
+    
+    # Try the known log formats without strptime
+    match = _TIMESTAMP_RE.fullmatch(timestamp)
+    if match:
+        try:
+            year, month, day, hour, minute, second, fraction = match.groups()
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour), int(minute), int(second),
+                int(fraction.ljust(6, "0")) if fraction else 0
+            )
+        except ValueError:
+            pass
+    
+    # Fall back to the other common formats
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(timestamp, fmt)
+        except ValueError:
+            continue
+    
+    return None
+
+def _normalize_event_in_place(normalized: Dict[str, Any], now: datetime):
+    """Normalize one event dictionary in place
+    
+    Args:
+        normalized: Event dictionary to normalize
+        now: Fallback time for missing or unparseable timestamps
+    """
     # Ensure timestamp is datetime
     if "timestamp" in normalized:
         timestamp = normalized["timestamp"]
         if isinstance(timestamp, str):
             try:
-                # Try ISO format first
-                normalized["timestamp"] = datetime.fromisoformat(timestamp)
-            except ValueError:
-                try:
-                    # Try other common formats
-                    common_formats = [
-                        "%Y.%m.%d-%H.%M.%S",
-                        "%Y.%m.%d-%H.%M.%S:%f",
-                        "%Y-%m-%d %H:%M:%S",
-                        "%Y-%m-%d %H:%M:%S.%f"
-                    ]
-                    
-                    for fmt in common_formats:
-                        try:
-                            normalized["timestamp"] = datetime.strptime(timestamp, fmt)
-                            break
-                        except ValueError:
-                            continue
-                            
+                parsed = _parse_timestamp(timestamp)
+                if parsed is None:
                     # If we still haven't parsed it, use current time
-                    if isinstance(normalized["timestamp"], str):
-                        logger.warning(f"Could not parse timestamp: {timestamp}")
-                        normalized["timestamp"] = datetime.utcnow()
-                except Exception as e:
-                    logger.error(f"Error parsing timestamp '{timestamp}': {e}")
-                    normalized["timestamp"] = datetime.utcnow()
+                    logger.warning(f"Could not parse timestamp: {timestamp}")
+                    parsed = now
+                normalized["timestamp"] = parsed
+            except Exception as e:
+                logger.error(f"Error parsing timestamp '{timestamp}': {e}")
+                normalized["timestamp"] = now
     else:
         # If no timestamp, add current time
-        normalized["timestamp"] = datetime.utcnow()
+        normalized["timestamp"] = now
     
-    # Normalize player identifiers
-    if "killer_id" in normalized and normalized["killer_id"] is None:
-        normalized["killer_id"] = ""
-        
-    if "victim_id" in normalized and normalized["victim_id"] is None:
-        normalized["victim_id"] = ""
-        
-    if "player_id" in normalized and normalized["player_id"] is None:
-        normalized["player_id"] = ""
+    # Cache the ISO form used by event hashing
+    if isinstance(normalized["timestamp"], datetime):
+        normalized["_ts_iso"] = normalized["timestamp"].isoformat()
     
-    # Normalize string fields
-    for field in ["killer_name", "victim_name", "player_name", "weapon", "location"]:
-        if field in normalized and normalized[field] is None:
+    # Normalize player identifiers and string fields
+    for field in _STRING_FIELDS:
+        if normalized.get(field, "") is None:
             normalized[field] = ""
     
     # Normalize numeric fields
-    for field in ["distance"]:
+    for field in _NUMERIC_FIELDS:
         if field in normalized and normalized[field] is None:
             normalized[field] = 0
             
@@ -270,7 +406,46 @@ def normalize_event_data(event: Dict[str, Any]) -> Dict[str, Any]:
                 normalized[field] = int(float(normalized[field]))
             except (ValueError, TypeError):
                 normalized[field] = 0
+
+def normalize_event_data(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize event data from different parser sources
+    
+    Ensures consistent field names and data types across all parser outputs.
     
+    Args:
+        event: Raw event dictionary
+        
+    Returns:
+        Dict: Normalized event dictionary
+    """
+    normalized = event.copy()
+    _normalize_event_in_place(normalized, datetime.utcnow())
+    return normalized
+
+def normalize_events(events: List[Dict[str, Any]], errors: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Normalize a batch of freshly parsed events in place
+    
+    Same normalization as normalize_event_data, without copying each event
+    and with one fallback time for the whole batch. An event that fails to
+    normalize is left out rather than failing the batch.
+    
+    Args:
+        events: Event dictionaries owned by the caller
+        errors: If given, receives a message for each event left out
+        
+    Returns:
+        List: The events that were normalized
+    """
+    now = datetime.utcnow()
+    normalized = []
+    for event in events:
+        try:
+            _normalize_event_in_place(event, now)
+        except Exception as e:
+            if errors is not None:
+                errors.append(str(e))
+            continue
+        normalized.append(event)
     return normalized
 
 def categorize_event(event: Dict[str, Any]) -> str:
@@ -283,14 +458,9 @@ def categorize_event(event: Dict[str, Any]) -> str:
         str: Event category (kill, suicide, connection, mission, game_event)
     """
     # If event has an explicit type, use it
-    if "event_type" in event:
-        event_type = event["event_type"]
-        if event_type in ["register", "unregister", "join", "kick"]:
-            return "connection"
-        elif event_type == "mission":
-            return "mission"
-        elif event_type in ["airdrop", "helicrash", "trader", "convoy"]:
-            return "game_event"
+    category = _EVENT_TYPE_CATEGORIES.get(event.get("event_type"))
+    if category is not None:
+        return category
             
     # Kill events have killer and victim fields
     if "killer_id" in event and "victim_id" in event:
@@ -2,9 +2,27 @@
 Server Validation Utilities
 
 This module contains utilities for validating server existence and handling server IDs consistently.
+
+Lookups here query the guilds collection by guild_id and by the server IDs
+embedded in servers, data.servers and server_ids. create_indexes must run at
+startup (bot.initialize_bot does this) so those queries use indexes instead of
+collection scans.
+
+All lookups go through one code path: get_server (cached, coalesced) for a
+single server and the guild cache for whole guilds. The db-first functions
+(get_server_by_id, check_server_exists, get_all_servers) are the canonical
+API; the discord.Guild-based check_server_existence and
+check_servers_existence wrap them and add the guild's servers_cache.
 """
+import asyncio
+import itertools
 import logging
-from typing import Optional, Union, Dict, Any
+import sys
+import time
+import weakref
+from collections import defaultdict
+from functools import lru_cache
+from typing import Optional, Union, Dict, Any, List, Tuple, Iterable, Set, Sequence
 
 import discord
 from models.server import Server
@@ -12,10 +30,296 @@ from models.guild import Guild
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=8192)
+def _norm_id(value: Union[str, int]) -> str:
+    """Normalize a guild or server ID to a stripped string"""
+    return str(value).strip()
+
+# Short-lived cache of server lookups: (guild_id, server_id) -> (fetched_at, server).
+# Misses expire sooner so a newly configured server is picked up quickly.
+# Lookups for arbitrary IDs would grow it forever, so it is pruned once it
+# holds _SERVER_CACHE_MAX entries.
+_SERVER_CACHE_TTL = 30.0
+_SERVER_MISS_TTL = 5.0
+_SERVER_CACHE_MAX = 10000
+_server_cache: Dict[Tuple[str, str], Tuple[float, Optional[Dict[str, Any]]]] = {}
+_server_fetches: Dict[Tuple[str, str], "asyncio.Future[Optional[Dict[str, Any]]]"] = {}
+# Bumped by invalidate_server so a lookup that was in flight across a write
+# does not cache what it read before the write
+_server_generations: Dict[Tuple[str, str], int] = {}
+
+# Short-lived cache of guild documents (server fields only): guild_id -> (fetched_at, guild).
+# Cold misses take a per-guild lock so concurrent callers share one fetch.
+_GUILD_CACHE_TTL = 30.0
+_guild_cache: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+_guild_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+_GUILD_PROJECTION = {"_id": 0, "guild_id": 1, "servers": 1, "data.servers": 1, "server_ids": 1}
+
+def _guild_id_variants(str_guild_id: str) -> List[Union[str, int]]:
+    """Guild IDs have been stored as both strings and ints; match either form"""
+    return [str_guild_id, int(str_guild_id)] if str_guild_id.isdigit() else [str_guild_id]
+
+def _cache_server(cache_key: Tuple[str, str], fetched_at: float, server: Optional[Dict[str, Any]]) -> None:
+    """Cache a server lookup, pruning the cache if it has grown too large"""
+    # Re-insert so the cache stays ordered oldest first
+    _server_cache.pop(cache_key, None)
+    _server_cache[cache_key] = (fetched_at, server)
+    if len(_server_cache) <= _SERVER_CACHE_MAX:
+        return
+
+    now = time.monotonic()
+    for key, (cached_at, cached) in list(_server_cache.items()):
+        if now - cached_at >= (_SERVER_CACHE_TTL if cached is not None else _SERVER_MISS_TTL):
+            del _server_cache[key]
+    # Still mostly live entries: drop the oldest quarter so pruning stays rare
+    if len(_server_cache) > _SERVER_CACHE_MAX * 3 // 4:
+        for key in list(itertools.islice(_server_cache, len(_server_cache) - _SERVER_CACHE_MAX * 3 // 4)):
+            del _server_cache[key]
+
+def invalidate_guild(guild_id: Union[str, int]) -> None:
+    """
+    Drop a cached guild document after the guild's servers change.
+
+    Args:
+        guild_id: Guild ID
+    """
+    _guild_cache.pop(_norm_id(guild_id), None)
+
+def invalidate_server(server_id: str, guild_id: Union[str, int]) -> None:
+    """
+    Drop cached lookups after a server is added, changed or removed.
+
+    Args:
+        server_id: Server ID
+        guild_id: Guild ID
+    """
+    cache_key = (_norm_id(guild_id), _norm_id(server_id))
+    _server_cache.pop(cache_key, None)
+    # A query already in flight may have read the old document: later callers
+    # must not join it, and its result must not be cached
+    _server_fetches.pop(cache_key, None)
+    _server_generations[cache_key] = _server_generations.get(cache_key, 0) + 1
+    invalidate_guild(guild_id)
+
+# Minimal server dicts for bare server IDs share interned keys and defaults
+_SID = sys.intern("server_id")
+_NAME = sys.intern("name")
+_PLATFORM = sys.intern("platform")
+_UNKNOWN = sys.intern("unknown")
+
+def _stub(str_server_id: str) -> Dict[str, Any]:
+    """Build the minimal server dict for a server known only by its ID"""
+    return {_SID: str_server_id, _NAME: "Server " + str_server_id, _PLATFORM: _UNKNOWN}
+
+def normalize_guild_document(guild_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Coerce every server ID in a guild document to a string, in place.
+
+    Run on guild documents before they are written and when they are cached,
+    so server ID lookups are plain string comparisons.
+
+    Args:
+        guild_data: Guild document or update fields
+
+    Returns:
+        Dict: The same document
+    """
+    legacy_data = guild_data.get("data")
+    for servers in (guild_data.get("servers"), legacy_data.get("servers") if isinstance(legacy_data, dict) else None):
+        for i, server in enumerate(servers or ()):
+            if isinstance(server, dict):
+                if server.get("server_id") is not None and not isinstance(server["server_id"], str):
+                    server["server_id"] = str(server["server_id"])
+            elif server is not None and not isinstance(server, str):
+                servers[i] = str(server)
+
+    server_ids = guild_data.get("server_ids")
+    if server_ids:
+        guild_data["server_ids"] = [
+            server_id if server_id is None or isinstance(server_id, str) else str(server_id)
+            for server_id in server_ids
+        ]
+
+    return guild_data
+
+def _build_server_index(guild_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index a guild's servers by normalized server ID.
+
+    Servers may live in "servers", the legacy "data.servers" or as bare IDs in
+    "server_ids"; bare IDs get a minimal server dict. Earlier sources win.
+    Server IDs must already be strings (see normalize_guild_document).
+
+    Args:
+        guild_data: Guild document
+
+    Returns:
+        Dict[str, Dict]: Server data keyed by server ID
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    legacy_data = guild_data.get("data")
+    legacy_servers = legacy_data.get("servers", []) if isinstance(legacy_data, dict) else []
+
+    for server in itertools.chain(guild_data.get("servers") or [], legacy_servers or [], guild_data.get("server_ids") or []):
+        if isinstance(server, dict):
+            if not isinstance(server.get("server_id"), str):
+                continue
+            str_server_id = server["server_id"].strip()
+        elif isinstance(server, str):
+            str_server_id = server.strip()
+            server = _stub(str_server_id)
+        else:
+            continue
+        if str_server_id:
+            index.setdefault(str_server_id, server)
+
+    return index
+
+def _cached_server_index(str_guild_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Return the server index of a freshly cached guild, if there is one.
+
+    A guild cached as missing has no servers, so negative lookups for it are
+    answered without querying.
+    """
+    cached = _guild_cache.get(str_guild_id)
+    if cached and time.monotonic() - cached[0] < _GUILD_CACHE_TTL:
+        return cached[1]["_server_index"] if cached[1] is not None else {}
+    return None
+
+async def _get_guild_cached(db, guild_id: Union[str, int]) -> Optional[Dict[str, Any]]:
+    """Fetch a guild's server fields, served from a short-lived cache"""
+    str_guild_id = _norm_id(guild_id)
+    cached = _guild_cache.get(str_guild_id)
+    if cached and time.monotonic() - cached[0] < _GUILD_CACHE_TTL:
+        return cached[1]
+
+    lock = _guild_locks.get(str_guild_id)
+    if lock is None:
+        lock = _guild_locks[str_guild_id] = asyncio.Lock()
+
+    async with lock:
+        # Another caller may have filled the cache while we waited
+        cached = _guild_cache.get(str_guild_id)
+        if cached and time.monotonic() - cached[0] < _GUILD_CACHE_TTL:
+            return cached[1]
+
+        guild_data = await db.guilds.find_one(
+            {"guild_id": {"$in": _guild_id_variants(str_guild_id)}},
+            _GUILD_PROJECTION
+        )
+        return _store_guild(str_guild_id, guild_data)
+
+def _store_guild(str_guild_id: str, guild_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Index a fetched guild's servers and put it in the guild cache"""
+    if guild_data is not None:
+        guild_data["_server_index"] = _build_server_index(normalize_guild_document(guild_data))
+        guild_data["_all_servers"] = tuple(guild_data["_server_index"].values())
+    _guild_cache[str_guild_id] = (time.monotonic(), guild_data)
+    return guild_data
+
+async def get_all_servers(db, guild_id: Union[str, int]) -> Sequence[Dict[str, Any]]:
+    """
+    Get every server configured for a guild, in any storage format.
+
+    The result is shared with the guild cache and must not be mutated; use
+    list(result) for a copy that can be changed.
+
+    Args:
+        db: Database connection
+        guild_id: Guild ID
+
+    Returns:
+        Sequence[Dict]: Server data, empty if the guild is unknown
+    """
+    guild_data = await _get_guild_cached(db, guild_id)
+    return guild_data["_all_servers"] if guild_data else ()
+
+async def get_servers_for_guilds(db, guild_ids: Iterable[Union[str, int]]) -> Dict[str, Sequence[Dict[str, Any]]]:
+    """
+    Get the servers of several guilds, fetching the guilds concurrently.
+
+    Args:
+        db: Database connection
+        guild_ids: Guild IDs
+
+    Returns:
+        Dict[str, Sequence[Dict]]: Server data keyed by normalized guild ID (shared, do not mutate)
+    """
+    str_guild_ids = list(dict.fromkeys(_norm_id(guild_id) for guild_id in guild_ids))
+    results = await asyncio.gather(*(get_all_servers(db, str_guild_id) for str_guild_id in str_guild_ids))
+    return dict(zip(str_guild_ids, results))
+
+async def check_servers_exist_bulk(
+    db,
+    pairs: Iterable[Tuple[Union[str, int], Union[str, int]]]
+) -> Dict[Tuple[str, str], bool]:
+    """
+    Check many (guild_id, server_id) pairs with a single database query.
+
+    Guilds that are freshly cached are answered from memory; the rest are
+    fetched together and cached.
+
+    Args:
+        db: Database connection
+        pairs: (guild_id, server_id) pairs to check
+
+    Returns:
+        Dict[Tuple[str, str], bool]: Existence flag keyed by normalized (guild_id, server_id)
+    """
+    servers_by_guild: Dict[str, Set[str]] = defaultdict(set)
+    for guild_id, server_id in pairs:
+        servers_by_guild[_norm_id(guild_id)].add(_norm_id(server_id))
+
+    indexes = {}
+    to_fetch = []
+    for str_guild_id in servers_by_guild:
+        server_index = _cached_server_index(str_guild_id)
+        if server_index is not None:
+            indexes[str_guild_id] = server_index
+        else:
+            to_fetch.append(str_guild_id)
+
+    if to_fetch:
+        guild_ids = [variant for str_guild_id in to_fetch for variant in _guild_id_variants(str_guild_id)]
+        async for guild_data in db.guilds.find({"guild_id": {"$in": guild_ids}}, _GUILD_PROJECTION):
+            str_guild_id = _norm_id(guild_data.get("guild_id", ""))
+            if str_guild_id in servers_by_guild:
+                indexes[str_guild_id] = _store_guild(str_guild_id, guild_data)["_server_index"]
+
+    return {
+        (str_guild_id, str_server_id): str_server_id in indexes.get(str_guild_id, ())
+        for str_guild_id, server_ids in servers_by_guild.items()
+        for str_server_id in server_ids
+    }
+
+async def create_indexes(db) -> None:
+    """
+    Ensure the guilds indexes that server lookups depend on exist.
+
+    Args:
+        db: Database connection
+    """
+    # One failure (e.g. duplicate guild_ids blocking the unique index) must
+    # not stop the other indexes from being created
+    for keys, options in (
+        ("guild_id", {"unique": True}),
+        ("servers.server_id", {}),
+        ("data.servers.server_id", {}),
+        ("server_ids", {}),
+    ):
+        try:
+            await db.guilds.create_index(keys, **options)
+        except Exception as e:
+            logger.warning("Could not ensure guilds index on %s: %s", keys, e)
+
 async def get_server(db, server_id: str, guild_id: Union[str, int]) -> Optional[Dict[str, Any]]:
     """
     Get server by ID and guild ID.
 
+    Results are cached for a few seconds (misses for less); call
+    invalidate_server after changing a guild's servers.
+
     Args:
         db: Database connection
         server_id: Server ID
@@ -25,30 +329,200 @@ async def get_server(db, server_id: str, guild_id: Union[str, int]) -> Optional[
         Optional[Dict]: Server data if found, None otherwise
     """
     # Ensure consistent type handling
-    str_guild_id = str(guild_id)
-    str_server_id = str(server_id)
-
-    # Get guild first using flexible query
-    guild_data = await db.guilds.find_one({
-        "$or": [
-            {"guild_id": str_guild_id},
-            {"guild_id": int(str_guild_id) if str_guild_id.isdigit() else str_guild_id}
-        ]
-    })
-    
-    if not guild_data:
+    str_guild_id = _norm_id(guild_id)
+    str_server_id = _norm_id(server_id)
+
+    cache_key = (str_guild_id, str_server_id)
+    now = time.monotonic()
+    cached = _server_cache.get(cache_key)
+    if cached and now - cached[0] < (_SERVER_CACHE_TTL if cached[1] is not None else _SERVER_MISS_TTL):
+        return cached[1]
+
+    # A freshly cached guild already knows all of its servers
+    server_index = _cached_server_index(str_guild_id)
+    if server_index is not None:
+        return server_index.get(str_server_id)
+
+    # Concurrent misses for the same server share one in-flight query
+    generation = _server_generations.get(cache_key, 0)
+    fetch = _server_fetches.get(cache_key)
+    if fetch is None:
+        fetch = _server_fetches[cache_key] = asyncio.ensure_future(_fetch_server(db, str_server_id, str_guild_id))
+        fetch.add_done_callback(lambda done: _forget_fetch(cache_key, done))
+
+    # shield() so one cancelled caller does not cancel the query for the others
+    server = await asyncio.shield(fetch)
+    if _server_generations.get(cache_key, 0) == generation:
+        _cache_server(cache_key, now, server)
+    return server
+
+def _forget_fetch(cache_key: Tuple[str, str], fetch: "asyncio.Future[Optional[Dict[str, Any]]]") -> None:
+    """Drop a finished query, unless invalidation already replaced it"""
+    if _server_fetches.get(cache_key) is fetch:
+        del _server_fetches[cache_key]
+
+async def _fetch_server(db, str_server_id: str, str_guild_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a server in its guild document"""
+    # Server IDs have been stored as both strings and ints, so match either
+    # form; filtering server-side returns only the matching server rather
+    # than every server of the guild
+    server_ids = [str_server_id, int(str_server_id)] if str_server_id.isdigit() else [str_server_id]
+
+    def matching(field: str) -> Dict[str, Any]:
+        # Entries are server dicts or, in legacy documents, bare server IDs
+        return {"$filter": {
+            "input": {"$ifNull": [field, []]},
+            "as": "s",
+            "cond": {"$or": [
+                {"$in": ["$$s.server_id", server_ids]},
+                {"$in": ["$$s", server_ids]}
+            ]}
+        }}
+
+    pipeline = [
+        {"$match": {"guild_id": {"$in": _guild_id_variants(str_guild_id)}}},
+        {"$limit": 1},
+        {"$project": {
+            "_id": 0,
+            "servers": matching("$servers"),
+            "data": {"servers": matching("$data.servers")},
+            "server_ids": matching("$server_ids")
+        }}
+    ]
+    results = await db.guilds.aggregate(pipeline).to_list(length=1)
+
+    if not results:
         return None
 
-    # Look for server in guild's servers with consistent string comparison
-    for server in guild_data.get("servers", []):
-        if str(server.get("server_id", "")).strip() == str_server_id.strip():
-            return server
+    return _build_server_index(normalize_guild_document(results[0])).get(str_server_id)
 
-    return None
+async def get_server_by_id(db, guild_id: Union[str, int], server_id: Union[str, int]) -> Optional[Dict[str, Any]]:
+    """
+    Get a server of a guild, whichever format the guild stores it in.
 
-async def get_server_by_id(db, server_id: str, guild_id: Union[str, int] = None) -> Optional[Dict[str, Any]]:
-    """Alias for get_server for compatibility"""
-    return await get_server(db, server_id, guild_id)
+    Args:
+        db: Database connection
+        guild_id: Guild ID
+        server_id: Server ID
+
+    Returns:
+        Optional[Dict]: Server data if found, None otherwise
+    """
+    if not isinstance(guild_id, (str, int)) or not isinstance(server_id, (str, int)):
+        return None
+    if not _norm_id(guild_id) or not _norm_id(server_id):
+        return None
+
+    try:
+        return await get_server(db, server_id, guild_id)
+    except Exception as e:
+        logger.error("Error getting server %s for guild %s: %s", server_id, guild_id, e)
+        return None
+
+async def check_server_exists(db, guild_id: Union[str, int], server_id: Union[str, int]) -> bool:
+    """
+    Check whether a guild has a server configured.
+
+    Args:
+        db: Database connection
+        guild_id: Guild ID
+        server_id: Server ID
+
+    Returns:
+        bool: True if the server exists
+    """
+    return (await get_server_by_id(db, guild_id, server_id)) is not None
+
+# Fields a server needs before its logs can be fetched
+_REQUIRED_SERVER_FIELDS = ("server_id", "sftp_host", "sftp_port", "sftp_username", "sftp_password")
+
+async def validate_server_config(
+    db,
+    guild_id: Union[str, int],
+    server_id: Union[str, int],
+    server: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Check that a server exists and has everything needed to process its logs.
+
+    Args:
+        db: Database connection
+        guild_id: Guild ID
+        server_id: Server ID
+        server: Server data if the caller already fetched it
+
+    Returns:
+        Dict: "valid", "exists", "missing_fields" and "error" keys
+    """
+    if server is None:
+        server = await get_server_by_id(db, guild_id, server_id)
+
+    if server is None:
+        return {
+            "valid": False,
+            "exists": False,
+            "missing_fields": [],
+            "error": f"Server {server_id} not found in guild {guild_id}"
+        }
+
+    return _config_report([field for field in _REQUIRED_SERVER_FIELDS if server.get(field) in (None, "")])
+
+def _config_report(missing_fields: List[str]) -> Dict[str, Any]:
+    """Build the validate_server_config result for an existing server"""
+    return {
+        "valid": not missing_fields,
+        "exists": True,
+        "missing_fields": missing_fields,
+        "error": f"Missing fields: {', '.join(missing_fields)}" if missing_fields else None
+    }
+
+async def validate_guild_servers(db, guild_id: Union[str, int]) -> Dict[str, Dict[str, Any]]:
+    """
+    Validate the configuration of every server of a guild in one query.
+
+    Missing fields are worked out by MongoDB, so server settings (including
+    credentials) never leave the database. Only the "servers" array is
+    checked; entries in the legacy formats have no connection settings.
+
+    Args:
+        db: Database connection
+        guild_id: Guild ID
+
+    Returns:
+        Dict[str, Dict]: validate_server_config results keyed by server ID
+    """
+    str_guild_id = _norm_id(guild_id)
+    pipeline = [
+        {"$match": {"guild_id": {"$in": _guild_id_variants(str_guild_id)}}},
+        {"$limit": 1},
+        {"$unwind": "$servers"},
+        # $objectToArray fails on non-documents, and stray bare IDs have no
+        # settings to check
+        {"$match": {"servers": {"$type": "object"}}},
+        {"$project": {
+            "_id": 0,
+            "server_id": {"$toString": "$servers.server_id"},
+            "missing_fields": {"$setDifference": [
+                list(_REQUIRED_SERVER_FIELDS),
+                {"$map": {
+                    "input": {"$filter": {
+                        "input": {"$objectToArray": "$servers"},
+                        "as": "kv",
+                        "cond": {"$not": [{"$in": ["$$kv.v", [None, ""]]}]}
+                    }},
+                    "as": "kv",
+                    "in": "$$kv.k"
+                }}
+            ]}
+        }}
+    ]
+
+    reports = {}
+    async for row in db.guilds.aggregate(pipeline):
+        # $setDifference does not keep order
+        missing = set(row["missing_fields"])
+        reports[row["server_id"]] = _config_report([field for field in _REQUIRED_SERVER_FIELDS if field in missing])
+    return reports
 
 async def check_server_existence(
     guild: discord.Guild, 
@@ -57,37 +531,73 @@ async def check_server_existence(
 ) -> bool:
     """
     Check if a server exists using multiple methods with fallbacks.
+
+    Args:
+        guild: Discord guild
+        server_id: Server ID
+        db: Database connection
+
+    Returns:
+        bool: True if the database or the guild's servers_cache knows the server
     """
     if not server_id:
         logger.warning("Empty server ID provided for validation")
         return False
 
     # Ensure server_id is a string for consistent comparison
-    server_id = str(server_id).strip()
+    server_id = _norm_id(server_id)
 
     try:
         # Method 1: Database validation (if db provided)
         if db:
-            server = await get_server(db, server_id, guild.id)
-            if server:
-                logger.debug(f"Server {server_id} validated through database")
+            if await check_server_exists(db, guild.id, server_id):
+                logger.debug("Server %s validated through database", server_id)
                 return True
 
         # Method 2: Guild cache validation
         if hasattr(guild, 'servers_cache'):
             if server_id in guild.servers_cache:
-                logger.debug(f"Server {server_id} validated through guild cache")
+                logger.debug("Server %s validated through guild cache", server_id)
                 return True
 
     except Exception as e:
-        logger.error(f"Error validating server {server_id}: {e}")
+        logger.error("Error validating server %s: %s", server_id, e)
 
-    logger.warning(f"Server {server_id} validation failed through all methods")
+    logger.warning("Server %s validation failed through all methods", server_id)
     return False
 
+async def check_servers_existence(
+    guild: discord.Guild,
+    server_ids: List[str],
+    db=None
+) -> Dict[str, bool]:
+    """
+    Check several servers of one guild with a single database lookup.
+
+    Args:
+        guild: Discord guild
+        server_ids: Server IDs to check
+        db: Database connection
+
+    Returns:
+        Dict[str, bool]: Existence flag for each requested server ID
+    """
+    known_ids = set()
+
+    try:
+        # Method 1: Database validation (if db provided)
+        if db:
+            known_ids.update(_norm_id(server["server_id"]) for server in await get_all_servers(db, guild.id))
+
+        # Method 2: Guild cache validation
+        if hasattr(guild, 'servers_cache'):
+            known_ids.update(guild.servers_cache)
+
+    except Exception as e:
+        logger.error("Error validating servers %s: %s", server_ids, e)
+
+    return {server_id: bool(server_id) and _norm_id(server_id) in known_ids for server_id in server_ids}
+
 def standardize_server_id(server_id: Union[str, int]) -> str:
     """Standardize server ID to string format for consistent handling."""
-    return str(server_id).strip()
-
-# Alias for backward compatibility
-check_server_exists = check_server_existence
\ No newline at end of file
+    return _norm_id(server_id)
\ No newline at end of file
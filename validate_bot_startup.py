@@ -15,6 +15,7 @@ import os
 import sys
 import logging
 import asyncio
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any
 
 logger = logging.getLogger(__name__)
@@ -26,24 +27,38 @@ async def validate_environment_variables() -> Tuple[bool, List[str]]:
     Returns:
         Tuple[bool, List[str]]: Success status and list of missing variables
     """
-    required_vars = [
-        "DISCORD_TOKEN",
-        "MONGODB_URI"
-    ]
-    
-    optional_vars = [
-        "MONGODB_DB",
-        "LOG_LEVEL",
-        "COMMAND_PREFIX"
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.environ.get(var):
-            missing_vars.append(var)
+    # The bot refuses to start without any of utils.env_config.REQUIRED_VARS;
+    # imported here so loading this module does not load dotenv
+    from utils.env_config import find_missing_vars
+    missing_vars = find_missing_vars()
     
     return len(missing_vars) == 0, missing_vars
 
+REQUIRED_DIRS = frozenset({"cogs", "utils", "models"})
+
+# Required files grouped by directory, so each directory is listed once
+REQUIRED_FILES = {
+    "": frozenset({"bot.py"}),
+    "utils": frozenset({"embed_builder.py", "helpers.py", "database.py"}),
+}
+
+@lru_cache(maxsize=None)
+def _scan(root: str) -> Dict[str, bool]:
+    """
+    List a directory once, mapping each entry name to whether it is a directory.
+    
+    Args:
+        root: Directory to list
+        
+    Returns:
+        Dict[str, bool]: Entry names and their is-directory flags, empty if root is missing
+    """
+    try:
+        with os.scandir(root) as entries:
+            return {entry.name: entry.is_dir() for entry in entries}
+    except OSError:
+        return {}
+
 async def validate_directory_structure() -> bool:
     """
     Validate the required directory structure exists.
@@ -51,16 +66,11 @@ async def validate_directory_structure() -> bool:
     Returns:
         bool: True if directory structure is valid
     """
-    required_dirs = [
-        "cogs",
-        "utils",
-        "models"
-    ]
-    
-    for dir_name in required_dirs:
-        if not os.path.isdir(dir_name):
-            logger.error(f"Required directory missing: {dir_name}")
-            return False
+    present_dirs = {name for name, is_dir in _scan(".").items() if is_dir}
+    missing_dirs = REQUIRED_DIRS - present_dirs
+    if missing_dirs:
+        logger.error(f"Required directories missing: {', '.join(sorted(missing_dirs))}")
+        return False
     
     return True
 
@@ -72,8 +82,8 @@ async def validate_database_connection() -> bool:
         bool: True if database connection is valid
     """
     try:
-        from utils.db import connect_to_mongodb
-        db = await connect_to_mongodb()
+        from utils.database import get_db
+        db = await get_db()
         if db:
             logger.info("Database connection verified")
             return True
@@ -91,17 +101,17 @@ async def validate_required_files() -> bool:
     Returns:
         bool: True if all required files exist
     """
-    required_files = [
-        "bot.py",
-        "utils/embed_builder.py",
-        "utils/helpers.py",
-        "utils/database.py"
+    missing_files = [
+        file_path
+        for dir_name, file_names in REQUIRED_FILES.items()
+        for file_path in (
+            os.path.join(dir_name, file_name) if dir_name else file_name
+            for file_name in sorted(file_names - {name for name, is_dir in _scan(dir_name or ".").items() if not is_dir})
+        )
     ]
-    
-    for file_path in required_files:
-        if not os.path.isfile(file_path):
-            logger.error(f"Required file missing: {file_path}")
-            return False
+    if missing_files:
+        logger.error(f"Required files missing: {', '.join(missing_files)}")
+        return False
     
     return True
 
@@ -112,7 +122,8 @@ async def validate_bot_token() -> bool:
     Returns:
         bool: True if token is valid
     """
-    token = os.environ.get("DISCORD_TOKEN")
+    from utils.env_config import get_env_snapshot
+    token = get_env_snapshot().get("DISCORD_TOKEN")
     if not token:
         logger.error("Discord token not found in environment variables")
         return False
@@ -133,27 +144,34 @@ async def validate_bot_configuration() -> Dict[str, Any]:
     """
     results = {}
     
+    # The checks are independent, so run them concurrently; a check that
+    # raises counts as failed without cancelling the others
+    env_result, dir_valid, db_valid, files_valid, token_valid = await asyncio.gather(
+        validate_environment_variables(),
+        validate_directory_structure(),
+        validate_database_connection(),
+        validate_required_files(),
+        validate_bot_token(),
+        return_exceptions=True
+    )
+    
     # Validate environment variables
-    env_valid, missing_vars = await validate_environment_variables()
+    if isinstance(env_result, BaseException):
+        logger.error(f"Error validating environment variables: {env_result}")
+        env_result = (False, [])
+    env_valid, missing_vars = env_result
     results["environment_variables"] = {
         "valid": env_valid,
         "missing": missing_vars
     }
     
-    # Validate directory structure
-    dir_valid = await validate_directory_structure()
+    # Any other check that raised failed
+    dir_valid, db_valid, files_valid, token_valid = (
+        result is True for result in (dir_valid, db_valid, files_valid, token_valid)
+    )
     results["directory_structure"] = dir_valid
-    
-    # Validate database connection
-    db_valid = await validate_database_connection()
     results["database_connection"] = db_valid
-    
-    # Validate required files
-    files_valid = await validate_required_files()
     results["required_files"] = files_valid
-    
-    # Validate bot token
-    token_valid = await validate_bot_token()
     results["bot_token"] = token_valid
     
     # Overall validation result
@@ -173,7 +191,13 @@ async def main():
     """
     logger.info("Validating bot configuration...")
     
-    results = await validate_bot_configuration()
+    try:
+        results = await validate_bot_configuration()
+    finally:
+        # Close the shared connection if the database check opened one
+        database = sys.modules.get("utils.database")
+        if database is not None:
+            await database.close_db()
     
     if results["overall"]:
         logger.info("Bot configuration is valid!")
@@ -181,18 +205,24 @@ async def main():
     else:
         logger.error("Bot configuration is invalid!")
         
-        # Print detailed validation results
+        # Print detailed validation results as one record
+        lines = []
         for key, value in results.items():
             if key != "overall":
                 if isinstance(value, dict):
-                    logger.info(f"{key}: {value['valid']}")
+                    lines.append(f"{key}: {value['valid']}")
                     if not value['valid'] and 'missing' in value:
-                        logger.info(f"  Missing: {', '.join(value['missing'])}")
+                        lines.append(f"  Missing: {', '.join(value['missing'])}")
                 else:
-                    logger.info(f"{key}: {value}")
+                    lines.append(f"{key}: {value}")
+        logger.info("\n".join(lines))
         
         return 1
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
+    # The format never shows thread or process details, so skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     asyncio.run(main())
\ No newline at end of file
@@ -27,6 +27,11 @@ logging.basicConfig(
     ]
 )
 
+# The format never shows thread or process details, so skip collecting them
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 logger = logging.getLogger("bot_verification")
 
 CRITICAL_MODULES = [
@@ -35,22 +40,44 @@ CRITICAL_MODULES = [
     "models.guild", "models.player", "models.bounty", "models.economy"
 ]
 
-CRITICAL_ENV_VARS = [
-    "DISCORD_TOKEN", "BOT_APPLICATION_ID", "HOME_GUILD_ID", "MONGODB_URI"
-]
+# Top-level packages that belong to this repo
+_LOCAL_PACKAGES = frozenset({"utils", "models", "cogs"})
+
+def _safe_import(module_name):
+    """Import a module, returning (name, success, error)"""
+    try:
+        importlib.import_module(module_name)
+        return module_name, True, None
+    except Exception as e:
+        # A failed import can surface as more than ImportError (e.g. a
+        # half-imported package or an import deadlock); report them all
+        return module_name, False, e
 
 async def verify_modules():
     """Verify that all critical modules can be imported"""
     logger.info("Verifying critical module imports...")
-    missing_modules = []
     
-    for module_name in CRITICAL_MODULES:
-        try:
-            importlib.import_module(module_name)
-            logger.info(f"✅ Module {module_name} successfully imported")
-        except ImportError as e:
-            logger.error(f"❌ Failed to import {module_name}: {e}")
-            missing_modules.append(module_name)
+    # Third-party packages are independent, so import them in worker threads
+    # to overlap cold-cache disk reads. The repo's own modules share packages
+    # (utils, models) that concurrent imports could tear down half-built when
+    # a dependency is missing, so import those one at a time
+    third_party = [m for m in CRITICAL_MODULES if m.partition(".")[0] not in _LOCAL_PACKAGES]
+    local = [m for m in CRITICAL_MODULES if m.partition(".")[0] in _LOCAL_PACKAGES]
+    outcomes = await asyncio.gather(*[asyncio.to_thread(_safe_import, m) for m in third_party])
+    outcomes.extend(_safe_import(m) for m in local)
+    # Log afterwards, in list order, so the output does not interleave
+    by_name = {outcome[0]: outcome for outcome in outcomes}
+    results = [by_name[module_name] for module_name in CRITICAL_MODULES]
+    
+    # One log record per outcome rather than one per module
+    imported = [name for name, ok, _ in results if ok]
+    if imported:
+        logger.info("✅ Modules successfully imported:\n  - " + "\n  - ".join(imported))
+    for module_name, ok, error in results:
+        if not ok:
+            logger.error(f"❌ Failed to import {module_name}: {error}")
+    
+    missing_modules = [name for name, ok, _ in results if not ok]
     
     if missing_modules:
         logger.critical(f"Missing critical modules: {', '.join(missing_modules)}")
@@ -62,12 +89,13 @@ async def verify_modules():
 def verify_env_vars():
     """Verify that all critical environment variables are set"""
     logger.info("Verifying critical environment variables...")
-    missing_vars = []
+    # Imported here so a missing dotenv is reported by verify_modules
+    from utils.env_config import REQUIRED_VARS, find_missing_vars
+    missing_vars = find_missing_vars()
     
-    for var in CRITICAL_ENV_VARS:
-        if not os.getenv(var):
+    for var in REQUIRED_VARS:
+        if var in missing_vars:
             logger.error(f"❌ Environment variable {var} is not set")
-            missing_vars.append(var)
         else:
             logger.info(f"✅ Environment variable {var} is set")
     
@@ -89,8 +117,8 @@ async def verify_database():
             logger.error("❌ Database connection failed - returned None")
             return False
         
-        # Check if we can access the database
-        guild_count = await db.db.guilds.count_documents({})
+        # Liveness probe only - an approximate count from collection metadata is fine
+        guild_count = await db.db.guilds.estimated_document_count()
         logger.info(f"✅ Database connection successful - found {guild_count} guilds")
         return True
     except Exception as e:
@@ -101,33 +129,27 @@ async def verify_discord_api():
     """Verify Discord API connectivity"""
     logger.info("Verifying Discord API connectivity...")
     try:
-        import discord
-        
-        # Create a test client
-        intents = discord.Intents.default()
-        intents.message_content = True
-        client = discord.Client(intents=intents)
-        
-        # Define an event for when the client is ready
-        @client.event
-        async def on_ready():
-            logger.info(f"✅ Discord API connection successful - logged in as {client.user}")
-            await client.close()
+        import aiohttp
+        from utils.env_config import get_env_snapshot
+        token = get_env_snapshot().get("DISCORD_TOKEN")
         
-        # Start the client
-        token = os.getenv("DISCORD_TOKEN")
+        # A single authenticated REST call proves the token works without
+        # building a discord.py client or opening the gateway
+        async with aiohttp.ClientSession(headers={"Authorization": f"Bot {token}"}) as session:
+            async with session.get(
+                "https://discord.com/api/v10/users/@me",
+                timeout=aiohttp.ClientTimeout(total=3)
+            ) as response:
+                if response.status != 200:
+                    logger.error(f"❌ Discord API rejected the token (HTTP {response.status})")
+                    return False
+                user = await response.json()
         
-        # Use a timeout to ensure we don't hang
-        try:
-            # Only try to connect for 10 seconds max
-            await asyncio.wait_for(client.start(token), 10)
-        except asyncio.TimeoutError:
-            logger.warning("⚠️ Discord API verification timed out but may still be working")
-            # Try to close properly
-            await client.close()
-            return True
-            
+        logger.info(f"✅ Discord API connection successful - logged in as {user['username']}")
         return True
+    except asyncio.TimeoutError:
+        logger.error("❌ Discord API connection timed out")
+        return False
     except Exception as e:
         logger.error(f"❌ Discord API connection failed: {e}")
         return False
@@ -138,8 +160,12 @@ async def verify_cogs():
     try:
         # Simply check if all cog files exist
         cog_dir = os.path.join(os.getcwd(), "cogs")
-        expected_cogs = [f[:-3] for f in os.listdir(cog_dir) 
-                         if f.endswith(".py") and not f.startswith("_")]
+        with os.scandir(cog_dir) as entries:
+            expected_cogs = sorted(
+                entry.name[:-3] for entry in entries
+                if entry.name.endswith(".py") and not entry.name.startswith("_")
+                and entry.is_file(follow_symlinks=False)
+            )
         
         logger.info(f"Found {len(expected_cogs)} potential cogs in the cogs directory")
         
@@ -147,12 +173,14 @@ async def verify_cogs():
         for cog_name in expected_cogs:
             try:
                 importlib.import_module(f"cogs.{cog_name}")
-                logger.info(f"✅ Successfully imported cog module: {cog_name}")
             except Exception as e:
                 logger.error(f"❌ Failed to import cog module {cog_name}: {e}")
                 return False
         
-        logger.info(f"✅ All {len(expected_cogs)} cog modules imported successfully")
+        logger.info(
+            f"✅ All {len(expected_cogs)} cog modules imported successfully:\n  - "
+            + "\n  - ".join(expected_cogs)
+        )
         return True
     except Exception as e:
         logger.error(f"❌ Cog verification failed: {e}")
@@ -172,14 +200,11 @@ async def main():
     ]
     
     # Display summary
-    logger.info("\n===== VERIFICATION SUMMARY =====")
-    all_passed = True
-    
-    for step_name, result in verification_steps:
-        status = "✅ PASSED" if result else "❌ FAILED"
-        logger.info(f"{step_name}: {status}")
-        if not result:
-            all_passed = False
+    all_passed = all(result for _, result in verification_steps)
+    logger.info("\n===== VERIFICATION SUMMARY =====\n" + "\n".join(
+        f"{step_name}: {'✅ PASSED' if result else '❌ FAILED'}"
+        for step_name, result in verification_steps
+    ))
     
     if all_passed:
         logger.info("\n✅ ALL VERIFICATION STEPS PASSED - BOT IS READY FOR DEPLOYMENT")
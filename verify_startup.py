@@ -12,23 +12,39 @@ This is a lightweight verification that doesn't actually connect to Discord,
 but validates all the startup code paths to ensure the bot will start correctly.
 """
 
+import atexit
 import importlib
 import logging
-import os
+import logging.handlers
+import queue
 import sys
 import asyncio
 import time
-from unittest.mock import patch, MagicMock
+
+def _setup_logging():
+    """Configure logging so console and file writes happen off the event loop"""
+    log_queue = queue.SimpleQueue()
+    # The queue carries bare messages; the listener's handlers add the layout
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[logging.handlers.QueueHandler(log_queue)])
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Append to one bounded log rather than growing it forever
+    file_handler = logging.handlers.RotatingFileHandler("verify_startup.log", maxBytes=10_000_000, backupCount=5)
+    handlers = [logging.StreamHandler(), file_handler]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The format never shows thread or process details, so skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("verify_startup.log")
-    ]
-)
+_setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -42,8 +58,8 @@ async def mock_startup_sequence():
     # Step 1: Check environment variables
     logger.info("Step 1: Checking environment variables")
     
-    required_vars = ["DISCORD_TOKEN", "BOT_APPLICATION_ID", "HOME_GUILD_ID", "MONGODB_URI"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    from utils.env_config import find_missing_vars
+    missing_vars = find_missing_vars()
     
     if missing_vars:
         logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
@@ -89,29 +105,32 @@ async def mock_startup_sequence():
     # Step 4: Mock bot startup
     logger.info("Step 4: Mocking bot startup")
     
-    # We'll patch the actual startup function that connects to Discord
+    # We'll swap out the actual startup function that connects to Discord
     # but let all the initialization code run
     try:
-        with patch("bot.startup") as mock_bot_startup:
-            # Set up mock to return a coroutine
-            async def mock_async_function():
-                await asyncio.sleep(0)
-                return True
-                
-            mock_bot_startup.return_value = mock_async_function()
-            
+        import bot
+        original_startup = bot.startup
+        
+        async def mock_startup():
+            await asyncio.sleep(0)
+            return True
+        
+        bot.startup = mock_startup
+        try:
             # Call the start_bot function
             main_module.start_bot()
-            
-            # If we got here without exceptions, startup validation passed
-            logger.info("Bot startup sequence completed successfully")
-            
-            return {
-                "success": True,
-                "step": "complete",
-                "error": None,
-                "time_taken": time.time() - start_time
-            }
+        finally:
+            bot.startup = original_startup
+        
+        # If we got here without exceptions, startup validation passed
+        logger.info("Bot startup sequence completed successfully")
+        
+        return {
+            "success": True,
+            "step": "complete",
+            "error": None,
+            "time_taken": time.time() - start_time
+        }
     except Exception as e:
         logger.error(f"Error during bot startup: {e}")
         return {
@@ -121,6 +140,33 @@ async def mock_startup_sequence():
             "time_taken": time.time() - start_time
         }
 
+SUCCESS_RECOMMENDATIONS = (
+    "- Run the bot with 'python main.py' to start it normally",
+    "- Use the Replit Run button which calls main.py",
+    "- Consider setting up Replit's Always On feature to keep the bot running",
+)
+
+# Recommendations for each step that can fail
+RECOMMENDATIONS = {
+    "environment_check": (
+        "- Add the missing environment variables to Replit Secrets",
+        "- Check .env file if you're running locally",
+    ),
+    "import_main": (
+        "- Check main.py for syntax errors",
+        "- Ensure all imports in main.py are available",
+    ),
+    "check_start_bot": (
+        "- Add a start_bot function to main.py",
+        "- Ensure main.py is set up correctly to start the bot",
+    ),
+    "bot_startup": (
+        "- Check bot.py for errors during initialization",
+        "- Ensure database connection settings are correct",
+        "- Check for errors in cog loading",
+    ),
+}
+
 
 def format_results(results):
     """Format verification results as a string
@@ -146,23 +192,9 @@ def format_results(results):
     # Add recommendations
     lines.append("\nRecommendations:")
     if results["success"]:
-        lines.append("- Run the bot with 'python main.py' to start it normally")
-        lines.append("- Use the Replit Run button which calls main.py")
-        lines.append("- Consider setting up Replit's Always On feature to keep the bot running")
+        lines.extend(SUCCESS_RECOMMENDATIONS)
     else:
-        if results["step"] == "environment_check":
-            lines.append("- Add the missing environment variables to Replit Secrets")
-            lines.append("- Check .env file if you're running locally")
-        elif results["step"] == "import_main":
-            lines.append("- Check main.py for syntax errors")
-            lines.append("- Ensure all imports in main.py are available")
-        elif results["step"] == "check_start_bot":
-            lines.append("- Add a start_bot function to main.py")
-            lines.append("- Ensure main.py is set up correctly to start the bot")
-        elif results["step"] == "bot_startup":
-            lines.append("- Check bot.py for errors during initialization")
-            lines.append("- Ensure database connection settings are correct")
-            lines.append("- Check for errors in cog loading")
+        lines.extend(RECOMMENDATIONS.get(results["step"], ()))
     
     return "\n".join(lines)
 